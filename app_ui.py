@@ -1,33 +1,54 @@
-from flask import Flask, request, jsonify, Response
-import threading
-import time
+import asyncio
+import hashlib
 import logging
-from typing import Optional
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
 
-# Configure logging for better debugging in production
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
+
+from config import configure_logging
+
+# Configure logging before bot (and its dependencies) create their loggers
+configure_logging()
 logger = logging.getLogger(__name__)
 
-try:
+if TYPE_CHECKING:
     from bot import BacBoBot
-except ImportError as e:
-    logger.error(f"Failed to import bot module: {e}")
-    BacBoBot = None
 
-app = Flask(__name__)
+
+@lru_cache(maxsize=1)
+def _bot_module():
+    """Import bot, and with it Selenium and the Telegram stack, on the first /start instead of at boot"""
+    try:
+        import bot
+        return bot
+    except ImportError as e:
+        logger.error("Failed to import bot module: %s", e)
+        return None
+
 
 # Shared bot instance and lock
-_bot_lock = threading.Lock()
-_bot_thread = None
-_bot_instance: Optional[BacBoBot] = None
+_bot_lock = asyncio.Lock()
+_bot_future: Optional[Future] = None
+_bot_instance: Optional["BacBoBot"] = None
+
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Pool workers are joined at interpreter exit, so let a running loop wind down
+    if _bot_instance is not None:
+        _bot_instance.stop()
 
-@app.get("/")
-def index() -> Response:
-    html = """
+
+app = FastAPI(title="Bac Bo Bot Controller", default_response_class=ORJSONResponse, lifespan=lifespan)
+
+
+# The controller page is static: encode it and hash it once at import
+_INDEX_HTML: bytes = """
 <!doctype html>
 <html>
 <head>
@@ -86,70 +107,94 @@ def index() -> Response:
   </script>
 </body>
 </html>
-"""
-    return Response(html, mimetype="text/html")
+""".encode("utf-8")
+_INDEX_ETAG = '"%s"' % hashlib.md5(_INDEX_HTML).hexdigest()
+_INDEX_HEADERS = {"ETag": _INDEX_ETAG, "Cache-Control": "public, max-age=300"}
+_INDEX_RESPONSE = Response(_INDEX_HTML, media_type="text/html", headers=_INDEX_HEADERS)
+
+
+_NOT_MODIFIED_RESPONSE = Response(status_code=304, headers=_INDEX_HEADERS)
+
+
+def _etag_matches(if_none_match: str) -> bool:
+    """RFC 9110 If-None-Match: a list of (possibly weak) tags, or *"""
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == _INDEX_ETAG for tag in if_none_match.split(","))
+
+
+@app.api_route("/", methods=["GET", "HEAD"], response_class=HTMLResponse)
+async def index(request: Request) -> Response:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match):
+        return _NOT_MODIFIED_RESPONSE
+    return _INDEX_RESPONSE
 
 
 @app.post("/start")
-def start_bot():
-    if BacBoBot is None:
-        return jsonify({"ok": False, "message": "Bot module not available. Check server logs."}), 500
+async def start_bot(request: Request):
+    bot_module = await asyncio.to_thread(_bot_module)
+    if bot_module is None:
+        return ORJSONResponse({"ok": False, "message": "Bot module not available. Check server logs."}, status_code=500)
     
-    payload = request.get_json(force=True, silent=True) or {}
+    try:
+        payload = await request.json()
+    except ValueError:
+        payload = None
+    if not isinstance(payload, dict):
+        payload = {}
     token = payload.get("token")
     chat_id = payload.get("chatId")
     if not token or not chat_id:
-        return jsonify({"ok": False, "message": "token and chatId are required"}), 400
+        return ORJSONResponse({"ok": False, "message": "token and chatId are required"}, status_code=400)
 
-    global _bot_thread, _bot_instance
+    global _bot_future, _bot_instance
     try:
-        with _bot_lock:
-            if _bot_thread and _bot_thread.is_alive():
-                return jsonify({"ok": True, "message": "Bot already running"})
-            _bot_instance = BacBoBot(token=token, chat_id=chat_id)
-            _bot_instance._stop = False
-            _bot_thread = threading.Thread(target=_bot_instance.run, daemon=True)
-            _bot_thread.start()
-        return jsonify({"ok": True, "message": "Bot starting..."})
+        async with _bot_lock:
+            if _bot_future and not _bot_future.done():
+                return ORJSONResponse({"ok": True, "message": "Bot already running"})
+            _bot_instance = bot_module.BacBoBot(token=token, chat_id=chat_id)
+            # The monitoring loop is blocking Selenium code, keep it off the event loop
+            _bot_future = bot_module.EXECUTOR.submit(_bot_instance.run)
+        return ORJSONResponse({"ok": True, "message": "Bot starting..."})
     except Exception as e:
-        logger.error(f"Error starting bot: {e}", exc_info=True)
-        return jsonify({"ok": False, "message": f"Failed to start bot: {str(e)}"}), 500
+        logger.error("Error starting bot: %s", e, exc_info=True)
+        return ORJSONResponse({"ok": False, "message": f"Failed to start bot: {str(e)}"}, status_code=500)
 
 
 @app.post("/stop")
-def stop_bot():
-    global _bot_thread, _bot_instance
-    with _bot_lock:
-        if _bot_instance is None:
-            return jsonify({"ok": True, "message": "Bot not running"})
-        try:
-            # Send stop message to Telegram before stopping
-            try:
-                if _bot_instance.telegram_bot:
-                    _bot_instance.telegram_bot.send_message("🛑 Bot stopped by user via web interface")
-                    time.sleep(0.5)  # Give message time to send
-            except Exception as e:
-                print(f"Error sending stop message: {e}")
-            
-            _bot_instance.stop()
-            time.sleep(1)
-        finally:
-            _bot_thread = None
-            _bot_instance = None
-    return jsonify({"ok": True, "message": "Bot stopping..."})
+async def stop_bot():
+    global _bot_future, _bot_instance
+    # Only the hand-off of the shared instance needs the lock
+    async with _bot_lock:
+        instance = _bot_instance
+        _bot_future = None
+        _bot_instance = None
+    if instance is None:
+        return ORJSONResponse({"ok": True, "message": "Bot not running"})
+    
+    # Only sets the stop event; the loop thread winds down on its own and its shutdown
+    # path sends the one "stopped" notice to Telegram
+    instance.stop()
+    return ORJSONResponse({"ok": True, "message": "Bot stopping..."}, status_code=202)
+
+
+# Fixed payloads for the endpoints that are polled the most
+_NOT_RUNNING_RESPONSE = ORJSONResponse({"running": False})
+_HEALTH_RESPONSE = ORJSONResponse({"status": "ok", "service": "bac-bo-bot"})
 
 
 @app.get("/status")
-def status():
+async def status():
     if _bot_instance is None:
-        return jsonify({"running": False})
-    return jsonify(_bot_instance.status())
+        return _NOT_RUNNING_RESPONSE
+    return ORJSONResponse(_bot_instance.status())
 
 
 @app.get("/health")
-def health():
+async def health():
     """Health check endpoint for Railway"""
-    return jsonify({"status": "ok", "service": "bac-bo-bot"}), 200
+    return _HEALTH_RESPONSE
 
 
 if __name__ == "__main__":
@@ -158,65 +203,45 @@ if __name__ == "__main__":
     import os
     import socket
     import sys
+    import uvicorn
     
-    def find_free_port(start_port=5000, max_attempts=10):
-        """Find a free port starting from start_port"""
-        for i in range(max_attempts):
-            test_port = start_port + i
-            try:
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                    s.bind(('127.0.0.1', test_port))
-                    return test_port
-            except OSError:
-                continue
-        raise RuntimeError(f"Could not find a free port starting from {start_port}")
+    def bind_free_port():
+        """Let the kernel pick a free ephemeral port on the loopback interface; the bound socket is
+        handed to uvicorn as is, so no other process can take the port in between"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(('127.0.0.1', 0))
+        return sock
     
     try:
         # Determine if we're in production (Railway/Heroku sets PORT)
         is_production = "PORT" in os.environ
         
-        # Use PORT env var if set (Railway/Heroku), otherwise find a free port for local dev
+        # Use PORT env var if set (Railway/Heroku), otherwise a free port for local dev
+        sock, port = None, None
         if is_production:
             port = int(os.environ.get("PORT", 5000))
             host = "0.0.0.0"  # Must bind to 0.0.0.0 for external connections in production
         else:
-            port = find_free_port(5000)
-            host = "127.0.0.1"  # Localhost for local development
-        
-        debug = os.environ.get("FLASK_ENV") != "production"
+            sock = bind_free_port()
+            host, port = sock.getsockname()  # Localhost for local development
         
-        logger.info("=" * 50)
-        logger.info("Bac Bo Bot Web UI Starting")
-        logger.info(f"Host: {host}")
-        logger.info(f"Port: {port}")
-        logger.info(f"Production mode: {is_production}")
-        logger.info(f"Debug: {debug}")
-        logger.info(f"Bot module available: {BacBoBot is not None}")
-        logger.info("=" * 50)
+        debug = os.environ.get("APP_ENV") != "production"
+        log_level = "debug" if debug else "info"
+        if not debug:
+            logger.warning("python app_ui.py is meant for development; "
+                           "production should run: gunicorn -c gunicorn.conf.py app_ui:app")
+
+        logger.info("Bac Bo Bot Web UI starting host=%s port=%s prod=%s debug=%s",
+                    host, port, is_production, debug)
         
-        app.run(host=host, port=port, debug=debug, use_reloader=False)
+        # uvloop/httptools are picked automatically when installed (not available on Windows)
+        config = uvicorn.Config(app, host=host, port=port, log_level=log_level, workers=1)
+        uvicorn.Server(config).run(sockets=[sock] if sock is not None else None)
     except OSError as e:
-        if "access permissions" in str(e).lower() or "permission denied" in str(e).lower():
-            if is_production:
-                # In production, we can't try alternative ports - fail fast
-                logger.error(f"Error: Port {port} requires elevated permissions or is already in use.")
-                logger.error("This is a production deployment issue. Check Railway logs for more details.")
-                sys.exit(1)
-            else:
-                # Local dev: try alternative port
-                logger.warning(f"Error: Port {port} requires elevated permissions or is already in use.")
-                logger.info("Trying alternative port...")
-                try:
-                    alt_port = find_free_port(5000)
-                    logger.info(f"Starting Flask app on http://{host}:{alt_port}")
-                    app.run(host=host, port=alt_port, debug=debug, use_reloader=False)
-                except Exception as e2:
-                    logger.error(f"Failed to start server: {e2}", exc_info=True)
-                    logger.error("Please try running with a different port or check if another process is using the port.")
-                    sys.exit(1)
-        else:
-            logger.error(f"OSError starting server: {e}", exc_info=True)
-            sys.exit(1)
+        logger.error("Error: Port %s could not be bound: %s", port, e, exc_info=True)
+        if is_production:
+            logger.error("This is a production deployment issue. Check Railway logs for more details.")
+        sys.exit(1)
     except Exception as e:
-        logger.error(f"Fatal error starting application: {e}", exc_info=True)
+        logger.error("Fatal error starting application: %s", e, exc_info=True)
         sys.exit(1)
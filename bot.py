@@ -1,62 +1,78 @@
 """
 Main bot for monitoring Bac Bo game and sending Telegram alerts
 """
+import atexit
 import logging
+import threading
 import time
-from typing import Optional
-from scraper import BacBoScraper
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Union
+from scraper import BacBoScraper, ScraperProcess, Stats
 from telegram_bot import BacBoTelegramBot
 from config import (
-    TELEGRAM_BOT_TOKEN,
-    TELEGRAM_CHAT_ID,
+    configure_logging,
+    get_bot_token,
+    get_chat_id,
+    get_headless,
+    use_scraper_process,
     BAC_BO_URL,
     SCRAPE_INTERVAL,
     PLAYER_WIN_THRESHOLD,
     DEFAULT_LANGUAGE,
-    HEADLESS,
     WAIT_TIMEOUT
 )
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,  # Changed to DEBUG for better troubleshooting
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Process-wide worker pool for the monitoring loop and short Telegram offloads
+EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bacbo")
+atexit.register(EXECUTOR.shutdown, wait=False)
+
+
+@dataclass(slots=True)
+class BotStatus:
+    """Status snapshot served by /status; orjson encodes it natively, no dict needed"""
+    running: bool
+    last_stats: Union[Stats, dict]
+    alert_threshold: int
+    scrape_interval: int
+
 
 class BacBoBot:
     """Main bot class for monitoring Bac Bo game"""
     
     def __init__(self, token: Optional[str] = None, chat_id: Optional[str] = None):
-        self.scraper = BacBoScraper(
+        scraper_cls = ScraperProcess if use_scraper_process() else BacBoScraper
+        self.scraper = scraper_cls(
             url=BAC_BO_URL,
-            headless=HEADLESS,
+            headless=get_headless(),
             wait_timeout=WAIT_TIMEOUT
         )
         # Allow overriding credentials at runtime
-        bot_token = token or TELEGRAM_BOT_TOKEN
-        bot_chat_id = chat_id or TELEGRAM_CHAT_ID
+        bot_token = token or get_bot_token()
+        bot_chat_id = chat_id or get_chat_id()
         self.telegram_bot = BacBoTelegramBot(
             token=bot_token,
             chat_id=bot_chat_id
         )
         self.language = DEFAULT_LANGUAGE
-        self.last_stats = None
+        self.last_stats: Optional[Stats] = None
         self.last_alert_time = 0
         self.alert_cooldown = 30  # seconds between alerts
-        self.last_stats_sent = None  # Track last stats sent to Telegram
-        self._stop = False
+        self.last_stats_sent: Optional[Stats] = None  # Track last stats sent to Telegram
+        self.last_status_time = 0  # When a status update was last queued, by either path
+        self._stop_event = threading.Event()  # Set from the web thread, read lock-free by the loop
         self.last_error_message_time = 0  # Track when we last sent error message
         self.error_message_cooldown = 300  # 5 minutes between error messages
         
-    def _should_send_alert(self, stats: dict) -> bool:
+    def _should_send_alert(self, stats: Optional[Stats]) -> bool:
         """Determine if we should send an alert based on stats"""
         if not stats:
             return False
         
         # Check if player percent is above threshold
-        if stats.get('player_percent', 0) > PLAYER_WIN_THRESHOLD:
+        if stats.player_percent > PLAYER_WIN_THRESHOLD:
             # Check cooldown to avoid spam
             current_time = time.time()
             if current_time - self.last_alert_time > self.alert_cooldown:
@@ -64,7 +80,13 @@ class BacBoBot:
         
         return False
     
-    def _detect_result(self, current_stats: dict, previous_stats: dict) -> Optional[str]:
+    def _alert_undelivered(self, alert_time: float):
+        """Runs on the Telegram loop thread: lift the cooldown an undelivered alert started"""
+        logger.error("❌ Entry alert was not delivered to Telegram")
+        if self.last_alert_time == alert_time:
+            self.last_alert_time = 0
+    
+    def _detect_result(self, current_stats: Optional[Stats], previous_stats: Optional[Stats]) -> Optional[str]:
         """
         Try to detect if there was a win or loss based on stat changes
         This is a heuristic approach - may need adjustment based on actual game behavior
@@ -91,15 +113,15 @@ class BacBoBot:
                     # Send status update even if stats can't be retrieved
                     self.telegram_bot.send_status_update(stats=None, language=self.language)
                     self.last_error_message_time = current_time
+                    self.last_status_time = current_time
                     logger.info("Sent error message to Telegram (cooldown applied)")
                 else:
-                    logger.debug(f"Skipping error message (cooldown: {self.error_message_cooldown}s)")
+                    logger.debug("Skipping error message (cooldown: %ss)", self.error_message_cooldown)
                 return False
             
             logger.info(
-                f"Stats - Player: {stats.get('player_percent')}%, "
-                f"Banker: {stats.get('banker_percent')}%, "
-                f"Tie: {stats.get('tie_percent')}%"
+                "Stats - Player: %s%%, Banker: %s%%, Tie: %s%%",
+                stats.player_percent, stats.banker_percent, stats.tie_percent
             )
             
             # Send real-time status update periodically
@@ -107,47 +129,54 @@ class BacBoBot:
             should_send_update = False
             if not self.last_stats_sent:
                 should_send_update = True
-            elif abs(stats.get('player_percent', 0) - self.last_stats_sent.get('player_percent', 0)) > 3:
+            elif abs(stats.player_percent - self.last_stats_sent.player_percent) > 3:
                 should_send_update = True
             
             if should_send_update:
                 self.telegram_bot.send_status_update(stats=stats, language=self.language)
-                self.last_stats_sent = stats.copy()
+                self.last_stats_sent = stats
+                self.last_status_time = time.time()
             
             # Check if we should send an alert
             if self._should_send_alert(stats):
-                player_pct = stats.get('player_percent', 0)
-                logger.info(f"Player percentage ({player_pct}%) exceeds threshold ({PLAYER_WIN_THRESHOLD}%)")
+                player_pct = stats.player_percent
+                logger.info("Player percentage (%s%%) exceeds threshold (%s%%)", player_pct, PLAYER_WIN_THRESHOLD)
                 
-                # Send entry alert
+                # Send entry alert; it is only queued here, so the cooldown starts now and is
+                # lifted again if Telegram never accepts the alert
+                previous_alert_time = self.last_alert_time
                 try:
+                    # Set before queueing, so an alert dropped right away can still lift its own cooldown
+                    alert_time = self.last_alert_time = time.time()
                     success = self.telegram_bot.send_entry_alert(
                         player_percent=player_pct,
-                        banker_percent=stats.get('banker_percent', 0),
-                        language=self.language
+                        banker_percent=stats.banker_percent,
+                        language=self.language,
+                        on_undelivered=lambda: self._alert_undelivered(alert_time)
                     )
                     
                     if success:
-                        logger.info("✅ Entry alert sent successfully to Telegram")
-                        self.last_alert_time = time.time()
-                        self.last_stats = stats.copy()
+                        logger.info("✅ Entry alert queued for Telegram")
+                        self.last_stats = stats
                         return True
                     else:
-                        logger.error("❌ Failed to send entry alert to Telegram")
+                        logger.error("❌ Failed to queue entry alert (Telegram bot not initialized?)")
+                        self.last_alert_time = previous_alert_time
                 except Exception as e:
-                    logger.error(f"Error sending entry alert: {e}", exc_info=True)
+                    logger.error("Error sending entry alert: %s", e, exc_info=True)
+                    self.last_alert_time = previous_alert_time
             
             # Update last stats
-            self.last_stats = stats.copy()
+            self.last_stats = stats
             return True
             
         except Exception as e:
-            logger.error(f"Error in run_once: {e}", exc_info=True)
+            logger.error("Error in run_once: %s", e, exc_info=True)
             # Send error notification
             try:
                 self.telegram_bot.send_message(f"⚠️ Error in monitoring cycle: {str(e)[:100]}")
-            except:
-                pass
+            except Exception:
+                logger.debug("Could not send cycle error notification", exc_info=True)
             return False
     
     def run(self):
@@ -159,12 +188,12 @@ class BacBoBot:
             logger.error("Telegram bot not properly configured. Please check TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID")
             return
         
-        # Send startup message
+        # Queued, so it goes out while Chrome launches; the outbox keeps it ahead of later messages
         try:
             self.telegram_bot.send_startup_message(language=self.language)
-            logger.info("Startup message sent to Telegram")
+            logger.info("Startup message queued for Telegram")
         except Exception as e:
-            logger.warning(f"Failed to send startup message: {e}")
+            logger.warning("Failed to send startup message: %s", e)
         
         # Initialize scraper
         try:
@@ -176,116 +205,104 @@ class BacBoBot:
                 self.telegram_bot.send_message("✅ Site opened successfully! Bot is now monitoring the game.")
                 logger.info("Site opened confirmation sent")
             except Exception as e:
-                logger.warning(f"Failed to send site opened message: {e}")
+                logger.warning("Failed to send site opened message: %s", e)
         except Exception as e:
-            logger.error(f"Failed to initialize scraper: {e}")
+            logger.error("Failed to initialize scraper: %s", e)
             try:
                 self.telegram_bot.send_message(f"❌ Failed to initialize scraper: {str(e)[:200]}")
-            except:
-                pass
+            except Exception:
+                logger.debug("Could not send scraper failure notification", exc_info=True)
+            self.telegram_bot.flush(timeout=30)
+            # Release the child, its Chrome instance and the profile lock a failed start leaves behind
+            try:
+                self.scraper.close()
+            except Exception as close_error:
+                logger.error("Error closing scraper: %s", close_error)
             return
         
         logger.info("Bot is running. Monitoring Bac Bo game...")
-        logger.info(f"Alert threshold: Player > {PLAYER_WIN_THRESHOLD}%")
-        logger.info(f"Scrape interval: {SCRAPE_INTERVAL} seconds")
+        logger.info("Alert threshold: Player > %s%%", PLAYER_WIN_THRESHOLD)
+        logger.info("Scrape interval: %s seconds", SCRAPE_INTERVAL)
         
         iteration_count = 0
-        last_status_update = 0
         status_update_interval = 30  # Send status update every 30 seconds
         
         try:
-            while not self._stop:
+            while not self._stop_event.is_set():
                 iteration_count += 1
                 current_time = time.time()
                 
                 # Run monitoring cycle
                 self.run_once()
                 
-                # Send periodic status update (every minute)
-                if current_time - last_status_update >= status_update_interval:
+                # Send periodic status update, unless run_once just queued one
+                if current_time - self.last_status_time >= status_update_interval:
                     try:
                         if self.last_stats:
                             self.telegram_bot.send_status_update(stats=self.last_stats, language=self.language)
                         else:
                             self.telegram_bot.send_status_update(stats=None, language=self.language)
-                        last_status_update = current_time
-                        logger.info(f"Sent periodic status update (iteration {iteration_count})")
+                        self.last_status_time = current_time
+                        logger.info("Sent periodic status update (iteration %d)", iteration_count)
                     except Exception as e:
-                        logger.warning(f"Failed to send periodic status update: {e}")
+                        logger.warning("Failed to send periodic status update: %s", e)
                 
-                time.sleep(SCRAPE_INTERVAL)
+                # Returns early as soon as stop() is called
+                if self._stop_event.wait(SCRAPE_INTERVAL):
+                    break
                 
         except KeyboardInterrupt:
             logger.info("Bot stopped by user")
             # Send message immediately before cleanup
             try:
                 self.telegram_bot.send_message("🛑 Bot stopped by user (KeyboardInterrupt)")
-                time.sleep(1)  # Give message time to send
             except Exception as e:
-                logger.error(f"Error sending stop message: {e}")
+                logger.error("Error sending stop message: %s", e)
         except Exception as e:
-            logger.error(f"Fatal error in run loop: {e}", exc_info=True)
+            logger.error("Fatal error in run loop: %s", e, exc_info=True)
             # Send error message immediately
             try:
                 self.telegram_bot.send_message(f"❌ Fatal error: {str(e)[:200]}")
-                time.sleep(1)
             except Exception as e2:
-                logger.error(f"Error sending error message: {e2}")
+                logger.error("Error sending error message: %s", e2)
         finally:
             # Always try to send shutdown message, even if there were errors
-            # Use a separate thread to ensure message is sent even if event loop is closing
-            import threading
-            
-            def send_shutdown():
-                try:
-                    shutdown_sent = self.telegram_bot.send_shutdown_message(language=self.language)
-                    if shutdown_sent:
-                        logger.info("✅ Shutdown message sent to Telegram")
-                    else:
-                        logger.warning("⚠️ Shutdown message send returned False")
-                        # Try simple message
-                        try:
-                            self.telegram_bot.send_message("🛑 Bot stopped")
-                        except:
-                            pass
-                except Exception as e:
-                    logger.error(f"Failed to send shutdown message: {e}")
-                    # Try one more time with a simple message
-                    try:
-                        self.telegram_bot.send_message("🛑 Bot stopped")
-                    except:
-                        pass
+            try:
+                if not self.telegram_bot.send_shutdown_message(language=self.language):
+                    logger.warning("⚠️ Shutdown message send returned False")
+            except Exception as e:
+                logger.error("Failed to send shutdown message: %s", e)
             
-            # Send shutdown message in a separate thread to avoid blocking
-            shutdown_thread = threading.Thread(target=send_shutdown, daemon=False)
-            shutdown_thread.start()
-            shutdown_thread.join(timeout=5)  # Wait max 5 seconds for message to send
+            # Deliver whatever is still queued (error notices, shutdown) before the scraper goes away
+            if self.telegram_bot.flush(timeout=5):  # Wait max 5 seconds for messages to send
+                logger.info("✅ Shutdown message sent to Telegram")
             
             # Close scraper after sending messages
             try:
                 self.scraper.close()
                 logger.info("Scraper closed")
             except Exception as e:
-                logger.error(f"Error closing scraper: {e}")
+                logger.error("Error closing scraper: %s", e)
             
             logger.info("Bot shutdown complete")
 
     def stop(self):
         """Signal the bot to stop gracefully"""
-        self._stop = True
+        self._stop_event.set()
 
-    def status(self) -> dict:
+    def status(self) -> BotStatus:
         """Return a lightweight status snapshot"""
-        return {
-            'running': not self._stop,
-            'last_stats': self.last_stats or {},
-            'alert_threshold': PLAYER_WIN_THRESHOLD,
-            'scrape_interval': SCRAPE_INTERVAL
-        }
+        return BotStatus(
+            running=not self._stop_event.is_set(),
+            last_stats=self.last_stats or {},
+            alert_threshold=PLAYER_WIN_THRESHOLD,
+            scrape_interval=SCRAPE_INTERVAL
+        )
 
 
 def main():
     """Main entry point"""
+    configure_logging()
     bot = BacBoBot()
     bot.run()
 
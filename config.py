@@ -1,14 +1,12 @@
 """
 Configuration file for Bac Bo bot
 """
+import atexit
+import logging
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-# Telegram Bot Configuration
-TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN', '8281858265:AAF0uvXOU3Kzn7z_kJsD4ppGxi3U9QEj6Hk')
-TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID', '8246955075')
+import queue
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 
 # Website Configuration
 BAC_BO_URL = 'https://www.vemabet10.com/pt/game/bac-bo/play-for-real'
@@ -21,15 +19,85 @@ PLAYER_WIN_THRESHOLD = 98  # percentage threshold for sending alerts
 DEFAULT_LANGUAGE = 'en'  # 'en' for English, 'pt' for Portuguese
 
 # Selenium Configuration
-# Auto-detect production environment (Railway/Heroku sets PORT env var)
-# In production, always use headless mode
-_is_production = "PORT" in os.environ or os.environ.get("FLASK_ENV") == "production"
-# In production, force headless=True. Otherwise, use HEADLESS env var or default to False
-HEADLESS = True if _is_production else (os.getenv("HEADLESS", "False").lower() == "true")
 WAIT_TIMEOUT = 30  # seconds to wait for elements to load
 
-# Log configuration for debugging (only import logging if needed)
-if _is_production:
-    import logging
-    logging.info(f"Production mode detected: HEADLESS={HEADLESS}, PORT env exists: {'PORT' in os.environ}")
 
+@lru_cache(maxsize=1)
+def configure_logging() -> None:
+    """Install the process-wide log setup once; level comes from LOG_LEVEL (.env or the environment).
+
+    An unknown level name falls back to INFO. Records are queued and written by a listener thread, so stream I/O never
+    blocks the caller (request handlers, the monitoring loop).
+    """
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    # Without a formatter of its own, basicConfig would give the queue handler its default one and
+    # every message would reach the listener already prefixed with "LEVEL:name:"
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    level = logging.getLevelName(_env()['LOG_LEVEL'])
+    logging.basicConfig(level=level if isinstance(level, int) else logging.INFO, handlers=[queue_handler])
+    listener.start()
+    atexit.register(listener.stop)
+    if not isinstance(level, int):
+        logging.warning("Unknown LOG_LEVEL %r, using INFO", _env()['LOG_LEVEL'])
+
+
+@lru_cache(maxsize=1)
+def _env() -> dict:
+    """Parse .env and the environment once, on first use (call _env.cache_clear() to re-read)"""
+    from dotenv import load_dotenv
+    load_dotenv()
+    return {
+        'TELEGRAM_BOT_TOKEN': os.getenv('TELEGRAM_BOT_TOKEN', '8281858265:AAF0uvXOU3Kzn7z_kJsD4ppGxi3U9QEj6Hk'),
+        'TELEGRAM_CHAT_ID': os.getenv('TELEGRAM_CHAT_ID', '8246955075'),
+        # Railway/Heroku set PORT, so its presence marks a production environment
+        'PRODUCTION': "PORT" in os.environ or os.environ.get("APP_ENV") == "production",
+        'HEADLESS': os.getenv("HEADLESS", "False").lower() == "true",
+        'SCRAPER_PROCESS': os.getenv("SCRAPER_PROCESS", "True").lower() == "true",
+        'BLOCK_HEAVY_RESOURCES': os.getenv("BLOCK_HEAVY_RESOURCES", "True").lower() == "true",
+        'LOG_LEVEL': os.getenv("LOG_LEVEL", "INFO").upper(),
+        'CHROME_PROFILE_DIR': os.getenv(
+            "CHROME_PROFILE_DIR",
+            os.path.join(os.path.expanduser("~"), ".cache", "bacbo_scraper", "chrome-profile")
+        ),
+    }
+
+
+# Telegram Bot Configuration
+def get_bot_token() -> str:
+    return _env()['TELEGRAM_BOT_TOKEN']
+
+
+def get_chat_id() -> str:
+    return _env()['TELEGRAM_CHAT_ID']
+
+
+def is_production() -> bool:
+    return _env()['PRODUCTION']
+
+
+@lru_cache(maxsize=1)
+def get_headless() -> bool:
+    """In production, always use headless mode. Otherwise, use HEADLESS env var or default to False"""
+    if is_production():
+        logging.info("Production mode detected: HEADLESS=True, PORT env exists: %s", 'PORT' in os.environ)
+        return True
+    return _env()['HEADLESS']
+
+
+def use_scraper_process() -> bool:
+    """Run Selenium in a child process (default); SCRAPER_PROCESS=false keeps it in the bot thread"""
+    return _env()['SCRAPER_PROCESS']
+
+
+def get_chrome_profile_dir() -> str:
+    """Persistent Chrome profile so HTTP and code caches survive restarts; CHROME_PROFILE_DIR="" uses a fresh one"""
+    return _env()['CHROME_PROFILE_DIR']
+
+
+def get_block_heavy_resources() -> bool:
+    """Skip image, font and media downloads in Chrome (default); BLOCK_HEAVY_RESOURCES=false loads everything"""
+    return _env()['BLOCK_HEAVY_RESOURCES']
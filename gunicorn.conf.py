@@ -0,0 +1,15 @@
+"""
+Gunicorn settings for production: python app_ui.py remains the dev entry point
+"""
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+# The bot instance and its scraper live in process memory, so a second worker
+# would serve /status from a process that never saw /start
+workers = 1
+keepalive = 75
+# Heartbeat files on tmpfs avoid worker stalls on slow container disks
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+# Leave the lifespan hook time to stop the scraper and send the shutdown message
+graceful_timeout = 30
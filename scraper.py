@@ -1,26 +1,33 @@
 """
 Web scraper for Bac Bo casino game statistics
 """
+import atexit
+import base64
+import hashlib
+import json
+import multiprocessing
 import os
 import platform
 import re
-from PIL import Image
+import threading
+from collections import Counter
+from PIL import Image, ImageChops, ImageOps
 import io
 
-# Set environment variable for Windows 64-bit before importing ChromeDriverManager
-if platform.system() == 'Windows':
-    os.environ['WDM_OS_TYPE'] = 'win64'
-
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support.ui import Select, WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException, WebDriverException
 import time
 import logging
-from typing import Dict, Optional
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Optional
+
+from config import configure_logging, get_block_heavy_resources, get_chrome_profile_dir
 
 # Try to import pytesseract for OCR
 try:
@@ -32,16 +39,491 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# innerText skips the per-node visibility pass WebElement.text runs, and slicing in
+# the browser keeps the diagnostics samples from shipping the whole body text
+_JS_BODY_TEXT = "const t = document.body ? document.body.innerText : ''; return arguments.length ? t.slice(0, arguments[0]) : t;"
+# Diagnostics sample and page size in one round trip
+_JS_PAGE_PROBE = (
+    "return {text: document.body ? document.body.innerText.slice(0, arguments[0]) : '',"
+    " html_length: document.documentElement.outerHTML.length};"
+)
+_JS_BODY_HAS_PERCENT = "return !!document.body && document.body.innerText.includes('%');"
+# The stats render either in the top document or inside the game iframe
+_JS_GAME_PRESENT = "return !!document.body && (/JOGADOR|PLAYER/i.test(document.body.innerText) || document.getElementsByTagName('iframe').length > 0);"
+_JS_PAGE_LANG = "return (document.documentElement.lang || '').toLowerCase();"
+_JS_ALL_ELEMENT_TEXTS = (
+    "return Array.prototype.map.call(document.querySelectorAll('*'),"
+    " function(e) { return (e.innerText || e.textContent || '').trim(); });"
+)
+# innerText of a list of elements in one round trip
+_JS_ELEMENTS_TEXT = "return arguments[0].map(function(e) { return e.innerText || ''; });"
+
+_PERCENT_RE = re.compile(r'(\d+)%')
+# Every label either language uses; the frozensets map an upper-cased hit back to its section
+_SECTION_RE = re.compile(r'JOGADOR|PLAYER|BANCA|BANKER|EMPATE|TIE', re.IGNORECASE)
+_PLAYER_KEYWORDS = frozenset(('JOGADOR', 'PLAYER'))
+_BANKER_KEYWORDS = frozenset(('BANCA', 'BANKER'))
+_TIE_KEYWORDS = frozenset(('EMPATE', 'TIE'))
+
+# Structured-layout fallback, one pass per text: "82% PLAYER" (pre) or "PLAYER 82%" (post),
+# with the group name telling which section and which form matched
+_SECTION_STAT_RE = re.compile(
+    r'(?P<player_pre>\d+)%\s*(?:JOGADOR|PLAYER)|(?:JOGADOR|PLAYER)\s*(?P<player_post>\d+)%'
+    r'|(?P<banker_pre>\d+)%\s*(?:BANCA|BANKER)|(?:BANCA|BANKER)\s*(?P<banker_post>\d+)%'
+    r'|(?P<tie_pre>\d+)%\s*(?:EMPATE|TIE)|(?:EMPATE|TIE)\s*(?P<tie_post>\d+)%',
+    re.IGNORECASE
+)
+
+# OCR of the statistics panel, left to right: labels then values, or values then labels
+_TRIPLET_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(?:JOGADOR|PLAYER)\D{0,20}(\d+)%\D{0,40}?(?:EMPATE|TIE)\D{0,20}(\d+)%\D{0,40}?(?:BANCA|BANKER)\D{0,20}(\d+)%',
+    r'(\d+)%\D{0,20}(?:JOGADOR|PLAYER)\D{0,40}?(\d+)%\D{0,20}(?:EMPATE|TIE)\D{0,40}?(\d+)%\D{0,20}(?:BANCA|BANKER)',
+))
+
+# Page-source fallback (run on upper-cased HTML): label then percentage, or percentage then
+# label, with up to 200 whole tags or text characters between them, so sibling and nested
+# tags (<SPAN>JOGADOR</SPAN><SPAN>45%</SPAN>) match; another '%' in between ends the match,
+# and a percentage inside a tag (STYLE="WIDTH:50%") is not a value
+_PAGE_SOURCE_GAP = r'(?:<[^>]*>|[^<%]){0,200}?'
+_PAGE_SOURCE_TEXT_PCT = r'%(?![^<>]*>)'
+_PAGE_SOURCE_STAT_RE = re.compile(
+    r'(?P<kw>JOGADOR|PLAYER|BANCA|BANKER|EMPATE|TIE)' + _PAGE_SOURCE_GAP + r'(?P<pct>\d+)' + _PAGE_SOURCE_TEXT_PCT
+    + r'|(?P<pct2>\d+)' + _PAGE_SOURCE_TEXT_PCT + _PAGE_SOURCE_GAP + r'(?P<kw2>JOGADOR|PLAYER|BANCA|BANKER|EMPATE|TIE)'
+)
+
+# Returns the in-range percentages found in element texts that carry a section label
+# (plus those texts), so only candidates cross the WebDriver wire. One walk over the
+# text nodes marks the elements holding both a '%' and a label somewhere below them;
+# innerText, which lays the element out, is only read for those. With a truthy argument
+# it also returns the upper-cased document HTML in the same call, unless the text alone
+# already settled all three sections.
+_JS_CLASSIFY_TEXT = """
+    var out = {player: [], banker: [], tie: [], samples: [], texts: [], scanned: 0};
+    var sections = [['player', 'Player'], ['banker', 'Banker'], ['tie', 'Tie']];
+    var sectionOf = {JOGADOR: 0, PLAYER: 0, BANCA: 1, BANKER: 1, EMPATE: 2, TIE: 2};
+    var anyLabel = /JOGADOR|PLAYER|BANCA|BANKER|EMPATE|TIE/i;
+    var allLabels = /JOGADOR|PLAYER|BANCA|BANKER|EMPATE|TIE/gi;
+    var allPercents = /\\d+%/g;
+    // Bit 1: a '%' below the element, bit 2: a label below it
+    var marks = new Map();
+    var walker = document.createTreeWalker(document.documentElement, NodeFilter.SHOW_TEXT);
+    for (var node = walker.nextNode(); node; node = walker.nextNode()) {
+        var value = node.nodeValue;
+        var bits = (value.indexOf('%') >= 0 ? 1 : 0) | (anyLabel.test(value) ? 2 : 0);
+        if (!bits) continue;
+        for (var el = node.parentElement; el; el = el.parentElement) {
+            var prev = marks.get(el) || 0;
+            // Marks always reach the root, so an ancestor that has these bits means all do
+            if ((prev | bits) === prev) break;
+            marks.set(el, prev | bits);
+        }
+    }
+    var all = document.querySelectorAll('*');
+    for (var i = 0; i < all.length; i++) {
+        if (marks.get(all[i]) !== 3) continue;
+        var text = (all[i].innerText || all[i].textContent || '').trim();
+        if (!text || text.length >= 500) continue;
+        out.scanned++;
+        var pcts = text.match(allPercents);
+        if (!pcts) continue;
+        // One match call finds every label, instead of one test per section
+        var labels = text.match(allLabels);
+        if (!labels) continue;
+        var hit = [false, false, false];
+        for (var l = 0; l < labels.length; l++) hit[sectionOf[labels[l].toUpperCase()]] = true;
+        var vals = [];
+        for (var j = 0; j < pcts.length; j++) {
+            var val = parseInt(pcts[j], 10);
+            if (val <= 100) vals.push(val);
+        }
+        for (var s = 0; s < sections.length; s++) {
+            if (!hit[s]) continue;
+            Array.prototype.push.apply(out[sections[s][0]], vals);
+            if (out.samples.length < 15) out.samples.push(sections[s][1] + ': ' + text.slice(0, 100));
+        }
+        out.texts.push(text);
+    }
+    // Confident: every section has at least 3 values and one value holds a majority of them
+    function confident(vals) {
+        var counts = {}, best = 0;
+        for (var k = 0; k < vals.length; k++) {
+            counts[vals[k]] = (counts[vals[k]] || 0) + 1;
+            if (counts[vals[k]] > best) best = counts[vals[k]];
+        }
+        return best >= 3 && best * 2 >= vals.length;
+    }
+    out.confident = confident(out.player) && confident(out.banker) && confident(out.tie);
+    out.html = (arguments[0] && !out.confident) ? document.documentElement.outerHTML.toUpperCase() : '';
+    return out;
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class Stats:
+    """Betting statistics from one scrape; immutable, so callers keep references instead of copies"""
+    player_percent: int
+    banker_percent: int
+    tie_percent: int
+    player_winning: bool
+    timestamp: float
+    extraction_method: Optional[str] = None
+
+
+# Tesseract only has to tell apart digits, '%' and the letters of the section labels
+_OCR_CONFIG = '-c tessedit_char_whitelist=0123456789%ABCDEGIJKLMNOPRTYabcdegijklmnoprty'
+
+
+def _otsu_threshold(histogram) -> int:
+    """Gray level that best splits a 256-bin histogram into two classes (Otsu's method)"""
+    total = sum(histogram)
+    weighted_total = sum(level * count for level, count in enumerate(histogram))
+    background = weighted_background = 0
+    best_level, best_variance = 0, -1.0
+    for level, count in enumerate(histogram):
+        background += count
+        if background == 0:
+            continue
+        foreground = total - background
+        if foreground == 0:
+            break
+        weighted_background += level * count
+        mean_background = weighted_background / background
+        mean_foreground = (weighted_total - weighted_background) / foreground
+        variance = background * foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_level, best_variance = level, variance
+    return best_level
+
+
+def _prepare_for_ocr(image):
+    """Two-tone grayscale copy of a screenshot, trimmed to where content is drawn"""
+    gray = ImageOps.autocontrast(image.convert('L'))
+    # The corner pixel stands in for the page background; uniform margins carry no text
+    background = Image.new('L', gray.size, gray.getpixel((0, 0)))
+    bbox = ImageChops.difference(gray, background).getbbox()
+    if bbox:
+        gray = gray.crop(bbox)
+    # Binarise at the Otsu level: Tesseract reads clean two-tone text faster and more reliably
+    threshold = _otsu_threshold(gray.histogram())
+    return gray.point([0 if level <= threshold else 255 for level in range(256)])
+
+
+def _ocr_lines(data) -> list:
+    """Words from image_to_data grouped into Tesseract's (block, paragraph, line) lines, in reading order"""
+    lines = {}
+    for word, block, par, line in zip(data['text'], data['block_num'], data['par_num'], data['line_num']):
+        word = word.strip()
+        if word:
+            lines.setdefault((block, par, line), []).append(word)
+    return list(lines.values())
+
+
+def _pair_line_labels(words) -> list:
+    """(label, value) pairs for one OCR line, each percentage bound to its own label.
+
+    A line reads either "PLAYER 45% TIE 10%" or "45% PLAYER 10% TIE"; whichever
+    comes first says on which side of a percentage its label sits.
+    """
+    tokens = []
+    for word in words:
+        label = _SECTION_RE.search(word)
+        pct = _PERCENT_RE.search(word)
+        found = []
+        if label:
+            found.append((label.start(), label.group().upper(), None))
+        if pct:
+            found.append((pct.start(), None, int(pct.group(1))))
+        # OCR may glue "45%PLAYER" into one word
+        tokens.extend((lbl, value) for _start, lbl, value in sorted(found, key=lambda item: item[0]))
+    if not tokens or not any(label for label, _ in tokens) or all(label for label, _ in tokens):
+        return []
+    if tokens[0][0] is None:
+        tokens.reverse()
+    pairs = []
+    current = None
+    for label, value in tokens:
+        if label:
+            current = label
+        elif current and value <= 100:
+            pairs.append((current, value))
+    return pairs
+
+
+def _most_common(values):
+    """Mode of values in one counting pass; ties go to the larger value"""
+    return max(Counter(values).items(), key=lambda kv: (kv[1], kv[0]))[0]
+
+
+def _remaining(deadline: float) -> float:
+    """Seconds left until a time.monotonic() deadline, floored so a wait still gets one poll"""
+    return max(0.5, deadline - time.monotonic())
+
+
+# Only text is read (DOM or OCR of the rendered page), so pictures, webfonts and the live
+# video stream are dead weight. Stylesheets stay: without them the screenshot layout breaks.
+_BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.mp4', '*.webm', '*.m3u8', '*.ts', '*.mp3',
+]
+
+# Common shapes of the page's language switcher, matched in one lookup
+_LANGUAGE_SWITCHER_XPATH = " | ".join([
+    "//button[contains(@class, 'language')]",
+    "//button[contains(text(), 'EN')]",
+    "//button[contains(text(), 'PT')]",
+    "//div[contains(@class, 'language')]//button",
+    "//button[@aria-label='Language']",
+    "//select[@id='language']",
+])
+
+# Likely stat containers that also mention a '%' or the player label, capped in the browser
+_UPPER_TEXT = "translate(., 'abcdefghijklmnopqrstuvwxyz', 'ABCDEFGHIJKLMNOPQRSTUVWXYZ')"
+_STAT_CONTAINER_XPATH = (
+    "(//*[contains(@class, 'stat') or contains(@class, 'bet') or contains(@id, 'stat') or contains(@id, 'bet')]"
+    f"[contains(., '%') or contains({_UPPER_TEXT}, 'JOGADOR') or contains({_UPPER_TEXT}, 'PLAYER')])"
+    "[position() <= 5]"
+)
+
+# Calls to get_betting_statistics closer together than this share one scrape (seconds)
+_MIN_SCRAPE_INTERVAL = 1.5
+# Seconds one scrape may spend waiting across all of its strategies
+_SCRAPE_BUDGET = 15
+# Seconds to wait for a '%' in the top document before extracting anyway; the stats often
+# only render inside the game iframe, which this check cannot see
+_FIRST_PERCENT_WAIT = 3
+# Consecutive scrapes without stats before the page is reloaded
+_REFRESH_AFTER_MISSES = 3
+# Seconds a due reload may wait for the statistics to come back; it runs even once the
+# scrape budget is used up, so a stuck page is still reloaded
+_REFRESH_WAIT = 15
+# Seconds to wait for the game iframe to be attached before looking inside the iframes
+_IFRAME_WAIT = 2
+
+_CHROMEDRIVER_NAMES = ('chromedriver', 'chromedriver.exe')
+_CHROMEDRIVER_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "bacbo_scraper", "chromedriver_path.json")
+_CHROME_VERSION_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "bacbo_scraper", "chrome_version.json")
+_CHROME_VERSION_RE = re.compile(r'(\d+\.\d+\.\d+\.\d+)')
+
+
+def _find_chromedriver_executable(root: str) -> Optional[str]:
+    """First chromedriver binary under root (webdriver-manager may return its NOTICES file or folder), made executable"""
+    for dirpath, _dirs, files in os.walk(root):
+        for name in _CHROMEDRIVER_NAMES:
+            if name in files:
+                full_path = os.path.join(dirpath, name)
+                try:
+                    os.chmod(full_path, 0o755)
+                except OSError as e:
+                    logger.debug("Could not make %s executable: %s", full_path, e)
+                    continue
+                return full_path
+    return None
+
+
+def _detect_chrome_version() -> Optional[str]:
+    """Installed Chrome/Chromium version on Linux (e.g. '120.0.6099.109'), or None.
+
+    The answer is kept on disk keyed by the binary's path and mtime, so
+    '--version' is only spawned again after the browser is updated.
+    """
+    import subprocess
+    for binary_path in ['/usr/bin/google-chrome', '/usr/bin/chromium-browser', '/usr/bin/chromium']:
+        if os.path.exists(binary_path):
+            mtime = os.path.getmtime(binary_path)
+            cached = _read_cached_chrome_version()
+            if cached.get('binary') == binary_path and cached.get('mtime') == mtime and cached.get('version'):
+                return cached['version']
+            result = subprocess.run([binary_path, '--version'], capture_output=True, text=True, timeout=5)
+            if result.returncode == 0 and result.stdout:
+                version_str = result.stdout.strip()
+                logger.info(f"Detected Chrome version: {version_str}")
+                # Extract version number (e.g., "Google Chrome 120.0.6099.109" -> "120.0.6099.109")
+                version_match = _CHROME_VERSION_RE.search(version_str)
+                if version_match:
+                    _write_cached_chrome_version(binary_path, mtime, version_match.group(1))
+                    return version_match.group(1)
+            break
+    return None
+
+
+def _read_cached_chrome_version() -> dict:
+    try:
+        with open(_CHROME_VERSION_CACHE_FILE, encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cached if isinstance(cached, dict) else {}
+
+
+def _write_cached_chrome_version(binary_path: str, mtime: float, version: str):
+    try:
+        os.makedirs(os.path.dirname(_CHROME_VERSION_CACHE_FILE), exist_ok=True)
+        with open(_CHROME_VERSION_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'binary': binary_path, 'mtime': mtime, 'version': version}, f)
+    except OSError as e:
+        logger.debug("Could not cache Chrome version: %s", e)
+
+
+def _read_cached_chromedriver(key: str) -> Optional[str]:
+    try:
+        with open(_CHROMEDRIVER_CACHE_FILE, encoding='utf-8') as f:
+            path = json.load(f).get(key)
+    except (OSError, ValueError):
+        return None
+    if path and os.path.isfile(path) and os.access(path, os.X_OK):
+        return path
+    return None
+
+
+def _write_cached_chromedriver(key: str, path: str):
+    try:
+        os.makedirs(os.path.dirname(_CHROMEDRIVER_CACHE_FILE), exist_ok=True)
+        with open(_CHROMEDRIVER_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({key: path}, f)
+    except OSError as e:
+        logger.debug("Could not cache chromedriver path: %s", e)
+
+
+def _lock_profile_dir(profile_dir: str):
+    """Exclusive lock on a Chrome profile directory, as an open file; None while another browser holds it.
+
+    Chrome refuses a --user-data-dir another instance is using, and a /stop followed by /start
+    (or a second process) can launch before the previous browser has quit. Closing the file
+    releases the lock.
+    """
+    try:
+        os.makedirs(profile_dir, exist_ok=True)
+        handle = open(os.path.join(profile_dir, '.bacbo_scraper.lock'), 'a+')
+    except OSError as e:
+        logger.warning("Could not open Chrome profile lock in %s: %s", profile_dir, e)
+        return None
+    try:
+        if platform.system() == 'Windows':
+            import msvcrt
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return None
+    return handle
+
+
+def _release_profile_lock(handle):
+    if handle is not None:
+        try:
+            handle.close()
+        except OSError:
+            pass
+
+
+@lru_cache(maxsize=1)
+def _chromedriver_path() -> str:
+    """Resolve chromedriver through webdriver-manager once per process; later launches reuse the path.
+
+    The resolved path is also kept on disk keyed by the browser version, so a
+    restart skips the install() lookup and the directory walks until Chrome updates.
+    """
+    cache_key = platform.system()
+    if platform.system() == 'Windows':
+        os.environ['WDM_OS_TYPE'] = 'win64'
+    else:
+        # For Linux/Railway, try to set Chrome version explicitly to avoid version detection issues
+        try:
+            chrome_version = _detect_chrome_version()
+            if chrome_version:
+                cache_key = chrome_version
+                # Set ChromeDriver version to match major version
+                major_version = chrome_version.split('.')[0]
+                os.environ['WDM_CHROMEDRIVER_VERSION'] = major_version
+                logger.info(f"Setting ChromeDriver version to: {major_version}")
+        except Exception as version_error:
+            logger.warning(f"Could not detect Chrome version: {version_error}")
+    
+    cached_path = _read_cached_chromedriver(cache_key)
+    if cached_path:
+        logger.info(f"Using cached chromedriver at: {cached_path}")
+        return cached_path
+    
+    # Silence webdriver-manager's logger and download progress bar (override via env)
+    os.environ.setdefault('WDM_LOG', '0')
+    os.environ.setdefault('WDM_PROGRESS_BAR', '0')
+    # Imported only here (after WDM_* env is set) so the usual Selenium Manager path never loads it
+    from webdriver_manager.chrome import ChromeDriverManager
+    
+    # Install ChromeDriver with error handling
+    try:
+        driver_path = ChromeDriverManager().install()
+        if driver_path is None:
+            raise ValueError("ChromeDriverManager.install() returned None")
+        
+        original_path = driver_path
+        logger.info(f"ChromeDriverManager returned path: {driver_path}")
+        
+        # Fix path resolution: ChromeDriverManager sometimes returns the wrong file
+        # (like THIRD_PARTY_NOTICES.chromedriver) or a directory
+        if os.path.isfile(driver_path):
+            filename = os.path.basename(driver_path)
+            if 'NOTICES' in filename or filename.endswith('.txt') or filename.endswith('.md'):
+                logger.warning(f"ChromeDriverManager returned wrong file: {filename}, searching for executable...")
+                same_dir = os.path.dirname(driver_path)
+                # Same directory first (most common case), then the parent
+                found = _find_chromedriver_executable(same_dir) or _find_chromedriver_executable(os.path.dirname(same_dir))
+                if not found:
+                    raise ValueError(f"ChromeDriverManager returned {original_path} and no chromedriver executable was found near it")
+                driver_path = found
+        elif os.path.isdir(driver_path):
+            found = _find_chromedriver_executable(driver_path)
+            if not found:
+                raise ValueError(f"ChromeDriverManager returned directory but chromedriver executable not found: {original_path}")
+            driver_path = found
+        else:
+            raise ValueError(f"ChromeDriver path is not a valid file: {driver_path}")
+        
+        # Make sure the file is executable (important for Linux)
+        os.chmod(driver_path, 0o755)
+        logger.info(f"Using chromedriver at: {driver_path}")
+            
+    except Exception as install_error:
+        if "'NoneType' object has no attribute 'split'" in str(install_error):
+            logger.error("ChromeDriverManager failed to detect Chrome version. This usually means Chrome is not installed.")
+            raise RuntimeError(
+                "Chrome/Chromium is not installed or not found. "
+                "On Railway, you may need to install Chrome in your build process. "
+                "Error: ChromeDriverManager could not detect Chrome version."
+            ) from install_error
+        raise
+    
+    _write_cached_chromedriver(cache_key, driver_path)
+    return driver_path
+
 
 class BacBoScraper:
     """Scraper for Bac Bo game statistics"""
     
+    # A closed scraper parks its Chrome session here, as (driver, profile lock), so the next one in
+    # this process skips the cold start
+    _shared_driver = None
+    _shared_driver_lock = threading.Lock()
+    
     def __init__(self, url: str, headless: bool = True, wait_timeout: int = 30):
         self.url = url
         self.headless = headless
         self.wait_timeout = wait_timeout
         self.driver = None
         self.current_language = 'en'
+        # Digest of the last OCR'd image and the stats read from it
+        self._ocr_memo = None
+        # Last scrape result and when it finished, shared by calls that arrive within _MIN_SCRAPE_INTERVAL
+        self._scrape_lock = threading.Lock()
+        self._last_scrape = None
+        # Scrapes in a row that found no stats; the page is only reloaded after _REFRESH_AFTER_MISSES
+        self._missed_scrapes = 0
+        # Lock on the persistent Chrome profile, held for as long as our browser uses it
+        self._profile_lock = None
         
     def _setup_driver(self):
         """Setup Chrome WebDriver.
@@ -55,6 +537,8 @@ class BacBoScraper:
         if effective_headless:
             # Use new headless mode (Chrome 109+)
             chrome_options.add_argument('--headless=new')
+        # Return from get() at DOMContentLoaded instead of after every subresource (trackers, stream)
+        chrome_options.page_load_strategy = 'eager'
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
         chrome_options.add_argument('--disable-blink-features=AutomationControlled')
@@ -75,6 +559,18 @@ class BacBoScraper:
         # Reduce fingerprinting
         chrome_options.add_argument('--disable-plugins-discovery')
         chrome_options.add_argument('--disable-default-apps')
+        # Reuse one on-disk profile so repeat launches start with a warm HTTP cache, but only while
+        # no other browser holds it; otherwise chromedriver's own throwaway profile is used
+        profile_dir = get_chrome_profile_dir()
+        if profile_dir and self._profile_lock is None:
+            self._profile_lock = _lock_profile_dir(profile_dir)
+            if self._profile_lock is None:
+                logger.warning("Chrome profile %s is in use, starting with a temporary profile", profile_dir)
+        if profile_dir and self._profile_lock is not None:
+            chrome_options.add_argument(f'--user-data-dir={profile_dir}')
+            chrome_options.add_argument('--profile-directory=Default')
+        if get_block_heavy_resources():
+            chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
         
         # Additional options for Railway/Linux environments
         if platform.system() != 'Windows':
@@ -130,6 +626,7 @@ class BacBoScraper:
                     window.chrome = {runtime: {}};
                 '''
             })
+            self._block_heavy_resources()
             logger.info("Using Selenium Manager for ChromeDriver (auto-managed)")
             logger.info(f"Headless mode: {effective_headless}, Platform: {platform.system()}")
             return
@@ -138,175 +635,7 @@ class BacBoScraper:
 
         # 2) Fallback: webdriver-manager with forced win64 on Windows
         try:
-            if platform.system() == 'Windows':
-                os.environ['WDM_OS_TYPE'] = 'win64'
-            else:
-                # For Linux/Railway, try to set Chrome version explicitly to avoid version detection issues
-                try:
-                    import subprocess
-                    # Try to get Chrome version
-                    for binary_path in ['/usr/bin/google-chrome', '/usr/bin/chromium-browser', '/usr/bin/chromium']:
-                        if os.path.exists(binary_path):
-                            result = subprocess.run([binary_path, '--version'], capture_output=True, text=True, timeout=5)
-                            if result.returncode == 0 and result.stdout:
-                                version_str = result.stdout.strip()
-                                logger.info(f"Detected Chrome version: {version_str}")
-                                # Extract version number (e.g., "Google Chrome 120.0.6099.109" -> "120.0.6099.109")
-                                import re
-                                version_match = re.search(r'(\d+\.\d+\.\d+\.\d+)', version_str)
-                                if version_match:
-                                    chrome_version = version_match.group(1)
-                                    # Set ChromeDriver version to match major version
-                                    major_version = chrome_version.split('.')[0]
-                                    os.environ['WDM_CHROMEDRIVER_VERSION'] = major_version
-                                    logger.info(f"Setting ChromeDriver version to: {major_version}")
-                            break
-                except Exception as version_error:
-                    logger.warning(f"Could not detect Chrome version: {version_error}")
-            
-            # Install ChromeDriver with error handling
-            try:
-                driver_path = ChromeDriverManager().install()
-                if driver_path is None:
-                    raise ValueError("ChromeDriverManager.install() returned None")
-                
-                original_path = driver_path
-                logger.info(f"ChromeDriverManager returned path: {driver_path}")
-                
-                # Fix path resolution: ChromeDriverManager sometimes returns wrong file or directory
-                # Check if it's the wrong file (like THIRD_PARTY_NOTICES.chromedriver)
-                if os.path.isfile(driver_path):
-                    filename = os.path.basename(driver_path)
-                    # If it's the wrong file, look in the same directory for the actual executable
-                    if 'NOTICES' in filename or filename.endswith('.txt') or filename.endswith('.md'):
-                        logger.warning(f"ChromeDriverManager returned wrong file: {filename}, searching for executable...")
-                        # First, check the same directory (most common case)
-                        same_dir = os.path.dirname(driver_path)
-                        chromedriver_path = os.path.join(same_dir, 'chromedriver')
-                        if os.path.isfile(chromedriver_path):
-                            try:
-                                os.chmod(chromedriver_path, 0o755)
-                                driver_path = chromedriver_path
-                                logger.info(f"Found chromedriver executable in same directory: {driver_path}")
-                            except Exception as e:
-                                logger.warning(f"Could not use chromedriver from same directory: {e}")
-                        
-                        # If not found in same directory, search more broadly
-                        if driver_path == original_path:
-                            search_dirs = [
-                                same_dir,  # Same directory
-                                os.path.dirname(same_dir),  # Parent directory
-                            ]
-                            for search_dir in search_dirs:
-                                if os.path.isdir(search_dir):
-                                    # Look for chromedriver executable
-                                    for root, dirs, files in os.walk(search_dir):
-                                        for file in files:
-                                            if file == 'chromedriver' and 'NOTICES' not in file:
-                                                full_path = os.path.join(root, file)
-                                                if os.path.isfile(full_path):
-                                                    try:
-                                                        os.chmod(full_path, 0o755)
-                                                        driver_path = full_path
-                                                        logger.info(f"Found chromedriver executable at: {driver_path}")
-                                                        break
-                                                    except Exception as e:
-                                                        logger.debug(f"Could not use {full_path}: {e}")
-                                                        continue
-                                        if driver_path != original_path:
-                                            break
-                                    if driver_path != original_path:
-                                        break
-                
-                # Fix path resolution: ChromeDriverManager sometimes returns a directory path
-                # We need to find the actual chromedriver executable
-                if os.path.isdir(driver_path):
-                    # Look for chromedriver executable in the directory
-                    possible_paths = [
-                        os.path.join(driver_path, 'chromedriver'),
-                        os.path.join(driver_path, 'chromedriver-linux64', 'chromedriver'),
-                        os.path.join(driver_path, 'chromedriver-linux', 'chromedriver'),
-                    ]
-                    for path in possible_paths:
-                        if os.path.isfile(path) and os.access(path, os.X_OK):
-                            driver_path = path
-                            logger.info(f"Found chromedriver executable at: {driver_path}")
-                            break
-                    else:
-                        # If not found, try to find any executable named chromedriver
-                        found_executable = False
-                        for root, dirs, files in os.walk(driver_path):
-                            for file in files:
-                                # Skip non-executable files like THIRD_PARTY_NOTICES
-                                if file == 'chromedriver' and 'NOTICES' not in file:
-                                    full_path = os.path.join(root, file)
-                                    if os.path.isfile(full_path):
-                                        # Try to make it executable and check
-                                        try:
-                                            os.chmod(full_path, 0o755)
-                                            if os.access(full_path, os.X_OK):
-                                                driver_path = full_path
-                                                logger.info(f"Found chromedriver executable at: {driver_path}")
-                                                found_executable = True
-                                                break
-                                        except Exception as e:
-                                            logger.debug(f"Could not make {full_path} executable: {e}")
-                                            continue
-                            if found_executable:
-                                break
-                    
-                    # If still a directory, raise error
-                    if os.path.isdir(driver_path):
-                        raise ValueError(f"ChromeDriverManager returned directory but chromedriver executable not found: {original_path}")
-                
-                # Final validation: make sure it's the actual executable file
-                if os.path.isfile(driver_path):
-                    # Check if it's the wrong file
-                    filename = os.path.basename(driver_path)
-                    if 'NOTICES' in filename or filename.endswith('.txt') or filename.endswith('.md'):
-                        # Still wrong file, search more thoroughly
-                        search_dir = os.path.dirname(driver_path)
-                        logger.warning(f"Path still points to wrong file, searching in: {search_dir}")
-                        for root, dirs, files in os.walk(search_dir):
-                            for file in files:
-                                if file == 'chromedriver' and 'NOTICES' not in file:
-                                    full_path = os.path.join(root, file)
-                                    if os.path.isfile(full_path):
-                                        try:
-                                            os.chmod(full_path, 0o755)
-                                            driver_path = full_path
-                                            logger.info(f"Found correct chromedriver executable at: {driver_path}")
-                                            break
-                                        except:
-                                            continue
-                            if 'NOTICES' not in os.path.basename(driver_path):
-                                break
-                    
-                    # Make sure the file is executable (important for Linux)
-                    os.chmod(driver_path, 0o755)
-                    logger.info(f"Using chromedriver at: {driver_path}")
-                else:
-                    raise ValueError(f"ChromeDriver path is not a valid file: {driver_path}")
-                    
-            except AttributeError as attr_error:
-                if "'NoneType' object has no attribute 'split'" in str(attr_error):
-                    logger.error("ChromeDriverManager failed to detect Chrome version. This usually means Chrome is not installed.")
-                    raise RuntimeError(
-                        "Chrome/Chromium is not installed or not found. "
-                        "On Railway, you may need to install Chrome in your build process. "
-                        "Error: ChromeDriverManager could not detect Chrome version."
-                    ) from attr_error
-                raise
-            except Exception as install_error:
-                if "'NoneType' object has no attribute 'split'" in str(install_error):
-                    logger.error("ChromeDriverManager failed to detect Chrome version. This usually means Chrome is not installed.")
-                    raise RuntimeError(
-                        "Chrome/Chromium is not installed or not found. "
-                        "On Railway, you may need to install Chrome in your build process. "
-                        "Error: ChromeDriverManager could not detect Chrome version."
-                    ) from install_error
-                raise
-            
+            driver_path = _chromedriver_path()
             service = Service(driver_path)
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
             # Additional stealth scripts to avoid detection
@@ -326,6 +655,7 @@ class BacBoScraper:
                 })
             except Exception as cdp_error:
                 logger.warning(f"CDP commands failed (may not be available): {cdp_error}")
+            self._block_heavy_resources()
             logger.info("Using webdriver-manager fallback for ChromeDriver")
             logger.info(f"Headless mode: {effective_headless}, Platform: {platform.system()}")
             return
@@ -333,52 +663,123 @@ class BacBoScraper:
             logger.error(f"webdriver-manager fallback failed: {e}", exc_info=True)
             raise
         
+    def _block_heavy_resources(self):
+        """Block font/media (and image) URLs at the network layer; the image pref misses CSS backgrounds"""
+        if not get_block_heavy_resources():
+            return
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': _BLOCKED_URL_PATTERNS})
+        except Exception as cdp_error:
+            logger.warning(f"Could not block heavy resources via CDP: {cdp_error}")
+    
     def _switch_language(self, target_language: str):
         """Switch page language to target language"""
         if self.current_language == target_language:
             return
             
         try:
-            # Try to find language switcher button
-            # Common selectors for language buttons
-            language_selectors = [
-                "//button[contains(@class, 'language')]",
-                "//button[contains(text(), 'EN')]",
-                "//button[contains(text(), 'PT')]",
-                "//div[contains(@class, 'language')]//button",
-                "//button[@aria-label='Language']",
-                "//select[@id='language']",
-            ]
+            # One wait on the union of the known switcher shapes instead of 5s per selector; any
+            # visible match will do, the first one in document order may be a hidden variant
+            try:
+                candidates = WebDriverWait(self.driver, 3).until(
+                    EC.visibility_of_any_elements_located((By.XPATH, _LANGUAGE_SWITCHER_XPATH))
+                )
+            except TimeoutException:
+                candidates = []
+            element = next((c for c in candidates if c.is_displayed() and c.is_enabled()), None)
+            
+            if element is not None:
+                if element.tag_name.lower() == 'select':
+                    Select(element).select_by_value(target_language)
+                else:
+                    element.click()
+                self._wait_for_language(target_language)
+                self.current_language = target_language
+                return
             
-            for selector in language_selectors:
-                try:
-                    if 'select' in selector:
-                        element = WebDriverWait(self.driver, 5).until(
-                            EC.presence_of_element_located((By.XPATH, selector))
-                        )
-                        from selenium.webdriver.support.ui import Select
-                        select = Select(element)
-                        select.select_by_value(target_language)
-                        time.sleep(2)
-                        self.current_language = target_language
-                        return
-                    else:
-                        element = WebDriverWait(self.driver, 5).until(
-                            EC.element_to_be_clickable((By.XPATH, selector))
-                        )
-                        element.click()
-                        time.sleep(2)
-                        self.current_language = target_language
-                        return
-                except:
-                    continue
-                    
             logger.warning(f"Could not find language switcher, keeping current language: {self.current_language}")
         except Exception as e:
             logger.error(f"Error switching language: {e}")
     
+    def _wait_for_language(self, target_language: str, timeout: float = 2):
+        """Return once <html lang> reports target_language; pages that never set it cost at most timeout"""
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                lambda d: d.execute_script(_JS_PAGE_LANG).startswith(target_language)
+            )
+        except TimeoutException:
+            logger.debug("Page lang did not switch to %s within %ss", target_language, timeout)
+    
+    def _wait_for_percent(self, timeout: float) -> bool:
+        """True as soon as the current document shows a '%', False once timeout passes without one"""
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.5).until(
+                lambda d: d.execute_script(_JS_BODY_HAS_PERCENT)
+            )
+            return True
+        except TimeoutException:
+            return False
+    
+    def _enter_frame(self, iframe, timeout: float):
+        """Switch into iframe once it is available, then give its content up to timeout to render a '%'"""
+        WebDriverWait(self.driver, timeout, poll_frequency=0.5).until(
+            EC.frame_to_be_available_and_switch_to_it(iframe)
+        )
+        self._wait_for_percent(timeout)
+    
+    @classmethod
+    def _take_shared_driver(cls):
+        """Claim the parked Chrome session, with its profile lock, if it is still alive"""
+        with cls._shared_driver_lock:
+            parked, cls._shared_driver = cls._shared_driver, None
+        if parked is None:
+            return None, None
+        driver, profile_lock = parked
+        try:
+            driver.current_url  # Raises once the session or browser has died
+            return driver, profile_lock
+        except Exception:
+            logger.debug("Parked Chrome session is gone, starting a new one", exc_info=True)
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            _release_profile_lock(profile_lock)
+            return None, None
+    
+    @classmethod
+    def _shutdown(cls):
+        """Quit the parked Chrome session (registered with atexit)"""
+        with cls._shared_driver_lock:
+            parked, cls._shared_driver = cls._shared_driver, None
+        if parked is not None:
+            driver, profile_lock = parked
+            try:
+                driver.quit()
+            except Exception:
+                logger.debug("Error quitting parked Chrome session", exc_info=True)
+            _release_profile_lock(profile_lock)
+    
+    def _quit_driver(self):
+        """Quit our browser for good and give up its profile lock"""
+        driver, self.driver = self.driver, None
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        _release_profile_lock(self._profile_lock)
+        self._profile_lock = None
+    
     def start(self):
         """Start the browser and navigate to the game page"""
+        if self.driver is None:
+            driver, profile_lock = self._take_shared_driver()
+            if driver is not None:
+                logger.info("Reusing parked Chrome session")
+                _release_profile_lock(self._profile_lock)
+                self.driver, self._profile_lock = driver, profile_lock
         if self.driver is None:
             logger.info("Initializing Chrome driver...")
             self._setup_driver()
@@ -398,9 +799,10 @@ class BacBoScraper:
                 self.driver.get(self.url)
                 logger.info(f"Page load initiated, waiting for completion...")
                 
-                # Wait for page to be interactive
+                # Wait for page to be interactive; with the eager strategy get() already returned
+                # at DOMContentLoaded, and the content waits below cover the rest
                 WebDriverWait(self.driver, 30).until(
-                    lambda d: d.execute_script('return document.readyState') == 'complete'
+                    lambda d: d.execute_script('return document.readyState') in ('interactive', 'complete')
                 )
                 
                 logger.info("Page loaded successfully")
@@ -411,23 +813,31 @@ class BacBoScraper:
                         lambda d: d.execute_script('return jQuery.active == 0') if d.execute_script('return typeof jQuery !== "undefined"') else True
                     )
                     logger.info("JavaScript execution completed")
-                except:
+                except WebDriverException:
                     logger.debug("jQuery check failed or not using jQuery, continuing...")
                 
-                # Wait additional time for dynamic content
-                time.sleep(10)  # Increased wait time for dynamic content
+                # Wait for dynamic content: a section label or the game iframe, not a fixed 10s
+                try:
+                    WebDriverWait(self.driver, self.wait_timeout, poll_frequency=0.25).until(
+                        lambda d: d.execute_script(_JS_GAME_PRESENT)
+                    )
+                except TimeoutException:
+                    logger.warning(f"Game content not detected after {self.wait_timeout}s, continuing anyway")
                 
-                # Execute JavaScript to trigger any lazy-loaded content
+                # Scroll to the bottom to trigger lazy-loaded content, and back up once the
+                # document has finished loading instead of after a fixed 3s
                 try:
-                    self.driver.execute_script("""
-                        // Scroll to trigger lazy loading
-                        window.scrollTo(0, document.body.scrollHeight);
-                        setTimeout(() => window.scrollTo(0, 0), 1000);
-                    """)
-                    time.sleep(3)
+                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                    try:
+                        WebDriverWait(self.driver, 3, poll_frequency=0.25).until(
+                            lambda d: d.execute_script('return document.readyState') == 'complete'
+                        )
+                    except TimeoutException:
+                        logger.debug("Document still loading after the lazy-load scroll")
+                    self.driver.execute_script("window.scrollTo(0, 0);")
                     logger.info("Triggered lazy loading by scrolling")
                 except Exception as scroll_error:
-                    logger.debug(f"Could not trigger lazy loading: {scroll_error}")
+                    logger.debug("Could not trigger lazy loading: %s", scroll_error)
                 
                 # Verify page actually loaded by checking title or URL
                 current_url = self.driver.current_url
@@ -435,7 +845,7 @@ class BacBoScraper:
                 logger.info(f"Current URL: {current_url}, Page title: {page_title[:100] if page_title else 'None'}")
                 
                 # Check if we're on the right page (not error page)
-                page_text = self.driver.find_element(By.TAG_NAME, "body").text[:500]
+                page_text = self.driver.execute_script(_JS_BODY_TEXT, 500)
                 if 'error' in page_text.lower() and '404' in page_text.lower():
                     raise Exception(f"Page returned error: {page_text[:200]}")
                 
@@ -460,12 +870,15 @@ class BacBoScraper:
                                 element = WebDriverWait(self.driver, 5).until(EC.element_to_be_clickable(elements[0]))
                                 element.click()
                                 logger.info("Clicked cookie/accept button")
-                                time.sleep(2)
+                                try:
+                                    WebDriverWait(self.driver, 2).until(EC.invisibility_of_element(element))
+                                except TimeoutException:
+                                    pass
                                 break
-                        except:
+                        except WebDriverException:
                             continue
                 except Exception as cookie_error:
-                    logger.debug(f"No cookie consent found or error: {cookie_error}")
+                    logger.debug("No cookie consent found or error: %s", cookie_error)
                 
                 # Switch to English if needed
                 try:
@@ -492,20 +905,22 @@ class BacBoScraper:
                     logger.error(f"Could not get diagnostics: {diag_error}")
                 
                 if attempt < max_retries - 1:
-                    logger.info(f"Retrying in 5 seconds...")
-                    time.sleep(5)
+                    logger.info("Retrying once the page has settled...")
                     try:
                         if self.driver:
                             # Try to close and recreate driver if it seems broken
                             if 'session' in error_msg.lower() or 'timeout' in error_msg.lower():
                                 logger.warning("Driver session appears broken, recreating...")
-                                try:
-                                    self.driver.quit()
-                                except:
-                                    pass
-                                self.driver = None
+                                self._quit_driver()
                                 self._setup_driver()
                             else:
+                                # Let the failed load finish (at most 5s) before reloading it
+                                try:
+                                    WebDriverWait(self.driver, 5, poll_frequency=0.25).until(
+                                        lambda d: d.execute_script('return document.readyState') == 'complete'
+                                    )
+                                except TimeoutException:
+                                    logger.debug("Page still loading before retry")
                                 self.driver.refresh()
                     except Exception as retry_error:
                         logger.error(f"Error during retry preparation: {retry_error}")
@@ -518,17 +933,13 @@ class BacBoScraper:
                     logger.error("4. Missing dependencies in production environment")
                     raise
         
-    def _extract_stats_from_context(self, driver_context, player_candidates=None, banker_candidates=None, tie_candidates=None) -> Optional[Dict]:
+    def _extract_stats_from_context(self, driver_context, player_candidates=None, banker_candidates=None, tie_candidates=None) -> Optional[Stats]:
         """Extract statistics from current driver context (main page or iframe)"""
-        import re
-        
         try:
             player_percent = None
             banker_percent = None
             tie_percent = None
             
-            percentage_pattern = r'(\d+)%'
-            
             # Initialize candidates if not provided
             if player_candidates is None:
                 player_candidates = []
@@ -537,267 +948,142 @@ class BacBoScraper:
             if tie_candidates is None:
                 tie_candidates = []
             
-            # First, try to get page source and search in it
-            try:
-                page_source = driver_context.page_source
-                # Look for percentage patterns near keywords
-                logger.debug(f"Page source length: {len(page_source)}")
-            except:
-                page_source = ""
-            
-            # Get all visible text elements
-            all_elements = driver_context.find_elements(By.XPATH, "//*")
-            logger.debug(f"Found {len(all_elements)} elements to check")
-            
             # Also collect all text that contains percentages for debugging
             debug_texts = []
+            # Texts carrying both a label and a percentage, for the structured-layout fallback
+            section_texts = None
             
-            # First, try to get all text from the page using JavaScript (more reliable)
+            # Classify text in the browser: one round-trip instead of one .text RPC per element,
+            # which also carries the page HTML instead of a separate page_source fetch
+            page_source = ""
             try:
-                all_text = driver_context.execute_script("""
-                    var allText = [];
-                    var all = document.querySelectorAll('*');
-                    for (var i = 0; i < all.length; i++) {
-                        var text = all[i].innerText || all[i].textContent || '';
-                        if (text && text.trim().length > 0 && text.trim().length < 500) {
-                            allText.push(text.trim());
-                        }
-                    }
-                    return allText;
-                """)
-                logger.debug(f"JavaScript extracted {len(all_text)} text elements")
-                
-                # Search through JavaScript-extracted text
-                for text in all_text:
-                    try:
-                        text_upper = text.upper()
-                        
-                        # Check for player section
-                        if any(keyword in text_upper for keyword in ['JOGADOR', 'PLAYER']):
-                            matches = re.findall(percentage_pattern, text)
-                            for match in matches:
-                                percent_val = float(match)
-                                if 0 <= percent_val <= 100:
-                                    player_candidates.append(percent_val)
-                                    if len(debug_texts) < 5:
-                                        debug_texts.append(f"Player: {text[:100]}")
-                        
-                        # Check for banker section
-                        if any(keyword in text_upper for keyword in ['BANCA', 'BANKER']):
-                            matches = re.findall(percentage_pattern, text)
-                            for match in matches:
-                                percent_val = float(match)
-                                if 0 <= percent_val <= 100:
-                                    banker_candidates.append(percent_val)
-                                    if len(debug_texts) < 10:
-                                        debug_texts.append(f"Banker: {text[:100]}")
-                        
-                        # Check for tie section
-                        if any(keyword in text_upper for keyword in ['EMPATE', 'TIE']):
-                            matches = re.findall(percentage_pattern, text)
-                            for match in matches:
-                                percent_val = float(match)
-                                if 0 <= percent_val <= 100:
-                                    tie_candidates.append(percent_val)
-                                    if len(debug_texts) < 15:
-                                        debug_texts.append(f"Tie: {text[:100]}")
-                    except:
-                        continue
-            except Exception as js_err:
-                logger.debug(f"JavaScript text extraction failed: {js_err}")
-            
-            # Also try traditional element extraction
-            for element in all_elements:
+                found = driver_context.execute_script(_JS_CLASSIFY_TEXT, True)
+                page_source = found['html']
+                # Already ints in 0..100 (parseInt in the browser)
+                player_candidates.extend(found['player'])
+                banker_candidates.extend(found['banker'])
+                tie_candidates.extend(found['tie'])
+                debug_texts = found['samples']
+                section_texts = found['texts']
+                logger.debug("JavaScript scanned %s text elements", found['scanned'])
+                if found['confident']:
+                    logger.debug("Text pass settled all three sections, skipping page source")
+            except (WebDriverException, KeyError, TypeError) as js_err:
+                logger.debug("JavaScript text extraction failed: %s", js_err)
                 try:
-                    text = element.text.strip()
-                    if not text or len(text) > 300:  # Skip very long texts
-                        continue
-                    
-                    text_upper = text.upper()
-                    
-                    # Check for player section
-                    if any(keyword in text_upper for keyword in ['JOGADOR', 'PLAYER']):
-                        matches = re.findall(percentage_pattern, text)
-                        for match in matches:
-                            percent_val = float(match)
-                            if 0 <= percent_val <= 100:
-                                player_candidates.append(percent_val)
-                                if len(debug_texts) < 5:
-                                    debug_texts.append(f"Player: {text[:100]}")
-                    
-                    # Check for banker section
-                    if any(keyword in text_upper for keyword in ['BANCA', 'BANKER']):
-                        matches = re.findall(percentage_pattern, text)
-                        for match in matches:
-                            percent_val = float(match)
-                            if 0 <= percent_val <= 100:
-                                banker_candidates.append(percent_val)
-                                if len(debug_texts) < 10:
-                                    debug_texts.append(f"Banker: {text[:100]}")
-                    
-                    # Check for tie section
-                    if any(keyword in text_upper for keyword in ['EMPATE', 'TIE']):
-                        matches = re.findall(percentage_pattern, text)
-                        for match in matches:
-                            percent_val = float(match)
-                            if 0 <= percent_val <= 100:
-                                tie_candidates.append(percent_val)
-                                if len(debug_texts) < 15:
-                                    debug_texts.append(f"Tie: {text[:100]}")
-                except:
-                    continue
+                    page_source = driver_context.page_source.upper()
+                except WebDriverException:
+                    page_source = ""
+            logger.debug("Page source length: %d", len(page_source))
             
             # Log debug info
             if debug_texts:
-                logger.info(f"Found potential stat texts: {debug_texts[:5]}")
+                logger.info("Found potential stat texts: %s", debug_texts[:5])
             logger.info(f"Player candidates: {player_candidates}, Banker: {banker_candidates}, Tie: {tie_candidates}")
             
             # Also try to search in page source directly with more patterns
             if page_source:
                 logger.info("Trying to extract from page source...")
-                # Search for patterns like "82%" near "JOGADOR" or "PLAYER"
-                # Try multiple patterns to catch different HTML structures
-                patterns = [
-                    r'(?:JOGADOR|PLAYER)[^>]*?(\d+)%',
-                    r'(\d+)%[^<]*?(?:JOGADOR|PLAYER)',
-                    r'<[^>]*>(?:JOGADOR|PLAYER)[^<]*?(\d+)%',
-                    r'(\d+)%[^<]*?<[^>]*>(?:JOGADOR|PLAYER)',
-                    r'(?:JOGADOR|PLAYER)[^>]{0,200}(\d+)%',
-                    r'(\d+)%[^>]{0,200}(?:JOGADOR|PLAYER)',
-                ]
-                
-                for pattern in patterns:
-                    player_matches = re.findall(pattern, page_source, re.IGNORECASE | re.DOTALL)
-                    if player_matches:
-                        for match in player_matches:
-                            try:
-                                val = float(match)
-                                if 0 <= val <= 100:
-                                    player_candidates.append(val)
-                                    logger.info(f"Found player percent {val}% in page source using pattern: {pattern[:50]}")
-                            except:
-                                pass
-                
-                # Same for banker
-                for pattern in patterns:
-                    banker_pattern = pattern.replace('JOGADOR|PLAYER', 'BANCA|BANKER')
-                    banker_matches = re.findall(banker_pattern, page_source, re.IGNORECASE | re.DOTALL)
-                    if banker_matches:
-                        for match in banker_matches:
-                            try:
-                                val = float(match)
-                                if 0 <= val <= 100:
-                                    banker_candidates.append(val)
-                                    logger.info(f"Found banker percent {val}% in page source")
-                            except:
-                                pass
-                
-                # Same for tie
-                for pattern in patterns:
-                    tie_pattern = pattern.replace('JOGADOR|PLAYER', 'EMPATE|TIE')
-                    tie_matches = re.findall(tie_pattern, page_source, re.IGNORECASE | re.DOTALL)
-                    if tie_matches:
-                        for match in tie_matches:
-                            try:
-                                val = float(match)
-                                if 0 <= val <= 100:
-                                    tie_candidates.append(val)
-                                    logger.info(f"Found tie percent {val}% in page source")
-                            except:
-                                pass
-                
-                # Also try to find all percentages in the page and match them to sections
-                all_percentages = re.findall(r'(\d+)%', page_source)
-                logger.info(f"Found {len(all_percentages)} total percentages in page source")
+                # One scan of the source: a label and a percentage (either order) at most 200
+                # tags or text characters apart, across sibling and nested tags
+                by_label = {
+                    'JOGADOR': player_candidates, 'PLAYER': player_candidates,
+                    'BANCA': banker_candidates, 'BANKER': banker_candidates,
+                    'EMPATE': tie_candidates, 'TIE': tie_candidates,
+                }
+                matched = 0
+                for match in _PAGE_SOURCE_STAT_RE.finditer(page_source):
+                    label = match.group('kw') or match.group('kw2')
+                    # \d+ captures are non-negative integers, so decode once and check the top only
+                    val = int(match.group('pct') or match.group('pct2'))
+                    if val <= 100:
+                        by_label[label].append(val)
+                        matched += 1
+                logger.info(f"Found {matched} labelled percentages in page source")
                 
-                # Look for percentages that are likely to be the statistics (between 0-100, common values)
-                for percent_str in all_percentages:
-                    try:
-                        val = float(percent_str)
-                        if 0 <= val <= 100:
-                            # Check context around this percentage
-                            idx = page_source.find(percent_str + '%')
-                            if idx >= 0:
-                                context_start = max(0, idx - 200)
-                                context_end = min(len(page_source), idx + 200)
-                                context = page_source[context_start:context_end].upper()
-                                
-                                if any(kw in context for kw in ['JOGADOR', 'PLAYER']):
-                                    if val not in player_candidates:
-                                        player_candidates.append(val)
-                                        logger.info(f"Found player percent {val}% from context")
-                                elif any(kw in context for kw in ['BANCA', 'BANKER']):
-                                    if val not in banker_candidates:
-                                        banker_candidates.append(val)
-                                        logger.info(f"Found banker percent {val}% from context")
-                                elif any(kw in context for kw in ['EMPATE', 'TIE']):
-                                    if val not in tie_candidates:
-                                        tie_candidates.append(val)
-                                        logger.info(f"Found tie percent {val}% from context")
-                    except:
-                        pass
+                # Context windows for the sections the scan left empty: every percentage, taken at
+                # its own match position, belongs to the first section (player, banker, tie)
+                # labelled within 200 chars of it, and is kept if that section is still empty
+                sections = (
+                    (_PLAYER_KEYWORDS, player_candidates, not player_candidates),
+                    (_BANKER_KEYWORDS, banker_candidates, not banker_candidates),
+                    (_TIE_KEYWORDS, tie_candidates, not tie_candidates),
+                )
+                if any(is_open for _keywords, _candidates, is_open in sections):
+                    for match in _PERCENT_RE.finditer(page_source):
+                        val = int(match.group(1))
+                        if val > 100:
+                            continue
+                        idx = match.start()
+                        labels = frozenset(_SECTION_RE.findall(page_source, max(0, idx - 200), idx + 200))
+                        for keywords, candidates, is_open in sections:
+                            if labels & keywords:
+                                if is_open and val not in candidates:
+                                    candidates.append(val)
+                                    logger.debug("Found percentage %s%% from page source context", val)
+                                break
             
             # Use the most common value, but prefer larger values for player (likely the main stat)
             if player_candidates:
                 # Use the most common, but if multiple, prefer the largest one (likely the main stat)
-                player_percent = max(set(player_candidates), key=lambda x: (player_candidates.count(x), x))
+                player_percent = _most_common(player_candidates)
                 logger.info(f"Selected player percent: {player_percent}% from candidates: {player_candidates}")
             if banker_candidates:
-                banker_percent = max(set(banker_candidates), key=lambda x: (banker_candidates.count(x), x))
+                banker_percent = _most_common(banker_candidates)
                 logger.info(f"Selected banker percent: {banker_percent}% from candidates: {banker_candidates}")
             if tie_candidates:
-                tie_percent = max(set(tie_candidates), key=lambda x: (tie_candidates.count(x), x))
+                tie_percent = _most_common(tie_candidates)
                 logger.info(f"Selected tie percent: {tie_percent}% from candidates: {tie_candidates}")
             
             # Alternative: try to find percentages in a structured layout
             # Look for elements that contain both label and percentage
             if player_percent is None or banker_percent is None or tie_percent is None:
-                # Try finding parent containers with structured data
-                for element in all_elements:
+                # Without the classification pass, still read every element's text in one round trip
+                if section_texts is None:
                     try:
-                        text = element.text.strip()
-                        if not text:
-                            continue
-                        
-                        # Look for patterns like "82% JOGADOR" or "Player 82%"
-                        matches = re.findall(r'(\d+)%\s*(?:JOGADOR|PLAYER)', text, re.IGNORECASE)
-                        if matches and player_percent is None:
-                            player_percent = float(matches[0])
-                        
-                        matches = re.findall(r'(?:JOGADOR|PLAYER)\s*(\d+)%', text, re.IGNORECASE)
-                        if matches and player_percent is None:
-                            player_percent = float(matches[0])
-                        
-                        matches = re.findall(r'(\d+)%\s*(?:BANCA|BANKER)', text, re.IGNORECASE)
-                        if matches and banker_percent is None:
-                            banker_percent = float(matches[0])
-                        
-                        matches = re.findall(r'(?:BANCA|BANKER)\s*(\d+)%', text, re.IGNORECASE)
-                        if matches and banker_percent is None:
-                            banker_percent = float(matches[0])
-                        
-                        matches = re.findall(r'(\d+)%\s*(?:EMPATE|TIE)', text, re.IGNORECASE)
-                        if matches and tie_percent is None:
-                            tie_percent = float(matches[0])
-                        
-                        matches = re.findall(r'(?:EMPATE|TIE)\s*(\d+)%', text, re.IGNORECASE)
-                        if matches and tie_percent is None:
-                            tie_percent = float(matches[0])
-                    except:
+                        section_texts = driver_context.execute_script(_JS_ALL_ELEMENT_TEXTS) or []
+                    except WebDriverException as e:
+                        logger.debug("Could not read element texts: %s", e)
+                        section_texts = []
+                
+                # Try finding parent containers with structured data
+                for text in section_texts:
+                    if not text:
                         continue
+                    
+                    # Look for patterns like "82% JOGADOR" or "Player 82%"; per section the first
+                    # "82% PLAYER" form still beats the first "PLAYER 82%" form
+                    first = {}
+                    for match in _SECTION_STAT_RE.finditer(text):
+                        first.setdefault(match.lastgroup, match.group(match.lastgroup))
+                    if not first:
+                        continue
+                    
+                    hit = first.get('player_pre', first.get('player_post'))
+                    if hit is not None and player_percent is None:
+                        player_percent = int(hit)
+                    hit = first.get('banker_pre', first.get('banker_post'))
+                    if hit is not None and banker_percent is None:
+                        banker_percent = int(hit)
+                    hit = first.get('tie_pre', first.get('tie_post'))
+                    if hit is not None and tie_percent is None:
+                        tie_percent = int(hit)
+                    
+                    if player_percent is not None and banker_percent is not None and tie_percent is not None:
+                        break
             
             # Validate that percentages make sense (should sum to ~100%)
             if player_percent is not None and banker_percent is not None and tie_percent is not None:
                 total = player_percent + banker_percent + tie_percent
                 # Allow some tolerance (85-110% to account for rounding)
                 if 85 <= total <= 110:
-                    stats = {
-                        'player_percent': player_percent,
-                        'banker_percent': banker_percent,
-                        'tie_percent': tie_percent,
-                        'player_winning': player_percent > 50,
-                        'timestamp': time.time()
-                    }
+                    stats = Stats(
+                        player_percent=player_percent,
+                        banker_percent=banker_percent,
+                        tie_percent=tie_percent,
+                        player_winning=player_percent > 50,
+                        timestamp=time.time()
+                    )
                     return stats
             
             # If we have at least player and banker, we can still use it
@@ -808,13 +1094,13 @@ class BacBoScraper:
                 if tie_percent < 0:
                     tie_percent = 0
                 
-                stats = {
-                    'player_percent': player_percent,
-                    'banker_percent': banker_percent,
-                    'tie_percent': tie_percent,
-                    'player_winning': player_percent > 50,
-                    'timestamp': time.time()
-                }
+                stats = Stats(
+                    player_percent=player_percent,
+                    banker_percent=banker_percent,
+                    tie_percent=tie_percent,
+                    player_winning=player_percent > 50,
+                    timestamp=time.time()
+                )
                 logger.info(f"Extracted stats (with calculated tie): Player={player_percent}%, Banker={banker_percent}%, Tie={tie_percent}%")
                 return stats
 
@@ -831,13 +1117,13 @@ class BacBoScraper:
                     if tie_percent < 0:
                         tie_percent = 0
                 
-                stats = {
-                    'player_percent': player_percent,
-                    'banker_percent': banker_percent,
-                    'tie_percent': tie_percent,
-                    'player_winning': player_percent > 50,
-                    'timestamp': time.time()
-                }
+                stats = Stats(
+                    player_percent=player_percent,
+                    banker_percent=banker_percent,
+                    tie_percent=tie_percent,
+                    player_winning=player_percent > 50,
+                    timestamp=time.time()
+                )
                 logger.info(f"Extracted stats (with estimated values): Player={player_percent}%, Banker={banker_percent:.1f}%, Tie={tie_percent:.1f}%")
                 return stats
             
@@ -848,7 +1134,7 @@ class BacBoScraper:
             logger.error(f"Error in _extract_stats_from_context: {e}")
             return None
     
-    def _extract_stats_from_screenshot(self) -> Optional[Dict]:
+    def _extract_stats_from_screenshot(self) -> Optional[Stats]:
         """
         Extract statistics from screenshot using OCR
         This is the primary method - it can read percentages directly from the visual page
@@ -864,193 +1150,190 @@ class BacBoScraper:
         try:
             logger.info("Taking screenshot for OCR extraction...")
             
-            # Get full page dimensions
-            total_width = self.driver.execute_script("return Math.max(document.body.scrollWidth, document.body.offsetWidth, document.documentElement.clientWidth, document.documentElement.scrollWidth, document.documentElement.offsetWidth);")
-            total_height = self.driver.execute_script("return Math.max(document.body.scrollHeight, document.body.offsetHeight, document.documentElement.clientHeight, document.documentElement.scrollHeight, document.documentElement.offsetHeight);")
+            # Full-page capture over CDP: no window resize, reflow and settle delay
+            metrics = self.driver.execute_cdp_cmd('Page.getLayoutMetrics', {})
+            content = metrics.get('cssContentSize') or metrics['contentSize']
+            shot = self.driver.execute_cdp_cmd('Page.captureScreenshot', {
+                'format': 'png',
+                'captureBeyondViewport': True,
+                'fromSurface': True,
+                'clip': {'x': 0, 'y': 0, 'width': content['width'], 'height': content['height'], 'scale': 1},
+            })
+            screenshot = base64.b64decode(shot['data'])
             
-            # Set viewport to full page size
-            original_size = self.driver.get_window_size()
-            self.driver.set_window_size(total_width, total_height)
-            time.sleep(2)  # Wait for resize
+            # Convert to PIL Image; Tesseract's cost grows with the pixels it is handed
+            image = _prepare_for_ocr(Image.open(io.BytesIO(screenshot)))
             
-            try:
-                # Take screenshot
-                screenshot = self.driver.get_screenshot_as_png()
-                
-                # Convert to PIL Image
-                image = Image.open(io.BytesIO(screenshot))
-                
-                # Use OCR to extract text
-                logger.info("Extracting text from screenshot using OCR...")
-                ocr_text = pytesseract.image_to_string(image, lang='eng')
-                
-                # Check if OCR returned None or empty
-                if ocr_text is None:
-                    logger.warning("OCR returned None, skipping OCR extraction")
-                    return None
-                
-                logger.debug(f"OCR extracted text length: {len(ocr_text)} characters")
-                logger.debug(f"OCR text sample: {ocr_text[:500]}")
-                
-                # Parse OCR text to find percentages
-                player_percent = None
-                banker_percent = None
-                tie_percent = None
-                
-                # Find all percentages in OCR text
-                percentage_pattern = r'(\d+)%'
-                all_percentages = re.findall(percentage_pattern, ocr_text)
-                logger.info(f"Found {len(all_percentages)} percentages in OCR text: {all_percentages[:10]}")
-                
-                # Convert to uppercase for case-insensitive matching
-                ocr_upper = ocr_text.upper()
-                
-                # Look for percentages near keywords
-                lines = ocr_text.split('\n') if ocr_text else []
-                for line in lines:
-                    line_upper = line.upper()
-                    
-                    # Find percentages in this line
-                    percentages_in_line = re.findall(percentage_pattern, line)
-                    
-                    # Check for player
-                    if any(kw in line_upper for kw in ['JOGADOR', 'PLAYER']):
-                        for pct in percentages_in_line:
-                            val = float(pct)
-                            if 0 <= val <= 100:
-                                if player_percent is None or val > player_percent:  # Take the largest if multiple
-                                    player_percent = val
-                                    logger.info(f"Found player percentage: {player_percent}% in line: {line[:100]}")
-                    
-                    # Check for banker
-                    if any(kw in line_upper for kw in ['BANCA', 'BANKER']):
-                        for pct in percentages_in_line:
-                            val = float(pct)
-                            if 0 <= val <= 100:
-                                if banker_percent is None or val > banker_percent:
-                                    banker_percent = val
-                                    logger.info(f"Found banker percentage: {banker_percent}% in line: {line[:100]}")
-                    
-                    # Check for tie
-                    if any(kw in line_upper for kw in ['EMPATE', 'TIE']):
-                        for pct in percentages_in_line:
-                            val = float(pct)
-                            if 0 <= val <= 100:
-                                if tie_percent is None or val > tie_percent:
-                                    tie_percent = val
-                                    logger.info(f"Found tie percentage: {tie_percent}% in line: {line[:100]}")
-                
-                # Also search in context around percentages (within 200 characters)
-                for percent_str in all_percentages:
-                    try:
-                        val = float(percent_str)
-                        if 0 <= val <= 100:
-                            # Find context around this percentage
-                            idx = ocr_text.find(percent_str + '%')
-                            if idx >= 0:
-                                context_start = max(0, idx - 200)
-                                context_end = min(len(ocr_text), idx + 200)
-                                context = ocr_text[context_start:context_end].upper()
-                                
-                                if any(kw in context for kw in ['JOGADOR', 'PLAYER']):
-                                    if player_percent is None or val > player_percent:
-                                        player_percent = val
-                                        logger.info(f"Found player percentage {val}% from context")
-                                elif any(kw in context for kw in ['BANCA', 'BANKER']):
-                                    if banker_percent is None or val > banker_percent:
-                                        banker_percent = val
-                                        logger.info(f"Found banker percentage {val}% from context")
-                                elif any(kw in context for kw in ['EMPATE', 'TIE']):
-                                    if tie_percent is None or val > tie_percent:
-                                        tie_percent = val
-                                        logger.info(f"Found tie percentage {val}% from context")
-                    except:
-                        continue
+            # Polls between panel updates see the same pixels; reuse the last reading for them
+            digest = hashlib.blake2b(image.tobytes(), digest_size=16, salt=b'%dx%d' % image.size).digest()
+            if self._ocr_memo is not None and self._ocr_memo[0] == digest:
+                logger.info("Screenshot unchanged since last OCR, reusing its statistics")
+                return replace(self._ocr_memo[1], timestamp=time.time())
+            
+            # Use OCR to extract text; word boxes let each percentage be paired with the label next to it
+            logger.info("Extracting text from screenshot using OCR...")
+            data = pytesseract.image_to_data(image, lang='eng', config=_OCR_CONFIG,
+                                             output_type=pytesseract.Output.DICT)
+            line_words = _ocr_lines(data)
+            lines = [' '.join(words) for words in line_words]
+            ocr_text = '\n'.join(lines)
+            
+            logger.debug("OCR extracted text length: %s characters", len(ocr_text))
+            logger.debug("OCR text sample: %s", ocr_text[:500])
+            
+            # Parse OCR text to find percentages
+            player_percent = None
+            banker_percent = None
+            tie_percent = None
+            
+            # Find all percentages in OCR text
+            all_percentages = _PERCENT_RE.findall(ocr_text)
+            logger.info(f"Found {len(all_percentages)} percentages in OCR text: {all_percentages[:10]}")
+            
+            # Convert to uppercase for case-insensitive matching
+            ocr_upper = ocr_text.upper()
+            
+            # The panel's usual shape, "PLAYER x% TIE y% BANKER z%" (labels before or after the
+            # values), settles all three sections in one search
+            for pattern in _TRIPLET_RES:
+                triplet = pattern.search(ocr_text)
+                if triplet:
+                    p_val, t_val, b_val = map(int, triplet.groups())
+                    if 90 <= p_val + t_val + b_val <= 110:
+                        player_percent, tie_percent, banker_percent = p_val, t_val, b_val
+                        logger.info(f"Matched P/T/B panel: {player_percent}/{tie_percent}/{banker_percent}")
+                        break
+            
+            if player_percent is None:
+                # Bind every percentage to its own label, so a "PLAYER 45% TIE 10% BANKER 45%"
+                # row gives each section its own value
+                for words, line in zip(line_words, lines):
+                    for label, val in _pair_line_labels(words):
+                        if label in _PLAYER_KEYWORDS:
+                            if player_percent is None or val > player_percent:  # Take the largest if multiple
+                                player_percent = val
+                                logger.info(f"Found player percentage: {player_percent}% in line: {line[:100]}")
+                        elif label in _BANKER_KEYWORDS:
+                            if banker_percent is None or val > banker_percent:
+                                banker_percent = val
+                                logger.info(f"Found banker percentage: {banker_percent}% in line: {line[:100]}")
+                        elif tie_percent is None or val > tie_percent:
+                            tie_percent = val
+                            logger.info(f"Found tie percentage: {tie_percent}% in line: {line[:100]}")
+            
+            # Labels and values on separate lines: search in context around percentages (within 200 characters).
+            # Each match brings its own position, so the windows are plain ranges of ocr_upper.
+            # Sections the line pairing already set are kept as they are: a larger number near
+            # their label is more likely a neighbouring section's.
+            player_open, banker_open, tie_open = player_percent is None, banker_percent is None, tie_percent is None
+            for match in _PERCENT_RE.finditer(ocr_upper):
+                # Only fills sections the lines left open; done once none is
+                if player_percent is not None and banker_percent is not None and tie_percent is not None:
+                    break
+                val = int(match.group(1))
+                if val > 100:
+                    continue
+                # Find context around this percentage
+                idx = match.start()
+                # Every label in the window from one scan, instead of six substring searches
+                labels = frozenset(_SECTION_RE.findall(ocr_upper, max(0, idx - 200), idx + 200))
                 
-                # Heuristic 1: Prefer lines that contain all three labels with percentages
-                if player_percent is None or banker_percent is None or tie_percent is None:
-                    for line in lines:
-                        parts = re.findall(percentage_pattern, line)
-                        if len(parts) >= 3:
-                            nums = [float(p) for p in parts[:3]]
-                            total = sum(nums)
-                            if 90 <= total <= 110:  # close to 100%
-                                lu = line.upper()
-                                # Try to map by label presence
-                                mapping = {'PLAYER': None, 'JOGADOR': None, 'TIE': None, 'EMPATE': None, 'BANKER': None, 'BANCA': None}
-                                # Assign in order if labels exist
-                                if any(k in lu for k in ['JOGADOR', 'PLAYER']) and any(k in lu for k in ['EMPATE', 'TIE']) and any(k in lu for k in ['BANCA', 'BANKER']):
-                                    # Assume left-to-right Player, Tie, Banker as shown on UI
-                                    p_val, t_val, b_val = nums[0], nums[1], nums[2]
+                if labels & _PLAYER_KEYWORDS:
+                    if player_open and (player_percent is None or val > player_percent):
+                        player_percent = val
+                        logger.info(f"Found player percentage {val}% from context")
+                elif labels & _BANKER_KEYWORDS:
+                    if banker_open and (banker_percent is None or val > banker_percent):
+                        banker_percent = val
+                        logger.info(f"Found banker percentage {val}% from context")
+                elif labels & _TIE_KEYWORDS:
+                    if tie_open and (tie_percent is None or val > tie_percent):
+                        tie_percent = val
+                        logger.info(f"Found tie percentage {val}% from context")
+            
+            # Heuristic 1: Prefer lines that contain all three labels with percentages
+            if player_percent is None or banker_percent is None or tie_percent is None:
+                # ocr_upper is the same lines joined, so splitting it upper-cases every line in one pass
+                for line, lu in zip(lines, ocr_upper.split('\n')):
+                    parts = _PERCENT_RE.findall(line)
+                    if len(parts) >= 3:
+                        nums = [int(p) for p in parts[:3]]
+                        total = sum(nums)
+                        if 90 <= total <= 110:  # close to 100%
+                            # Assign in order if labels exist
+                            if any(k in lu for k in ['JOGADOR', 'PLAYER']) and any(k in lu for k in ['EMPATE', 'TIE']) and any(k in lu for k in ['BANCA', 'BANKER']):
+                                # Assume left-to-right Player, Tie, Banker as shown on UI
+                                p_val, t_val, b_val = nums[0], nums[1], nums[2]
+                                player_percent = p_val
+                                tie_percent = t_val
+                                banker_percent = b_val
+                                logger.info(f"Mapped three-inline percentages P/T/B: {player_percent}/{tie_percent}/{banker_percent} from line: {line[:120]}")
+                                break
+                            # If no labels but exactly 3 numbers, still assume left-to-right P/T/B
+                            if len(nums) == 3 and (player_percent is None or banker_percent is None or tie_percent is None):
+                                p_val, t_val, b_val = nums[0], nums[1], nums[2]
+                                if 0 <= p_val <= 100 and 0 <= t_val <= 100 and 0 <= b_val <= 100:
                                     player_percent = p_val
                                     tie_percent = t_val
                                     banker_percent = b_val
-                                    logger.info(f"Mapped three-inline percentages P/T/B: {player_percent}/{tie_percent}/{banker_percent} from line: {line[:120]}")
+                                    logger.info(f"Assumed order P/T/B for inline triplet: {player_percent}/{tie_percent}/{banker_percent}")
                                     break
-                                # If no labels but exactly 3 numbers, still assume left-to-right P/T/B
-                                if len(nums) == 3 and (player_percent is None or banker_percent is None or tie_percent is None):
-                                    p_val, t_val, b_val = nums[0], nums[1], nums[2]
-                                    if 0 <= p_val <= 100 and 0 <= t_val <= 100 and 0 <= b_val <= 100:
-                                        player_percent = p_val
-                                        tie_percent = t_val
-                                        banker_percent = b_val
-                                        logger.info(f"Assumed order P/T/B for inline triplet: {player_percent}/{tie_percent}/{banker_percent}")
-                                        break
-
-                # Heuristic 2: If we can find any three percentages anywhere that sum ~100, take the most plausible triplet
-                if (player_percent is None or banker_percent is None or tie_percent is None) and len(all_percentages) >= 3:
-                    nums = [float(x) for x in all_percentages if 0 <= float(x) <= 100]
-                    best = None
-                    # Check sliding windows of three
-                    for i in range(len(nums) - 2):
-                        triplet = nums[i:i+3]
-                        total = sum(triplet)
-                        if 90 <= total <= 110:
-                            # prefer triplets where middle is smaller (tie usually lower)
-                            score = -abs(triplet[1] - min(triplet))
-                            if not best or score > best[0]:
-                                best = (score, triplet)
-                    if best:
-                        p_val, t_val, b_val = best[1]
-                        player_percent = player_percent if player_percent is not None else p_val
-                        tie_percent = tie_percent if tie_percent is not None else t_val
-                        banker_percent = banker_percent if banker_percent is not None else b_val
-                        logger.info(f"Selected best triplet P/T/B: {player_percent}/{tie_percent}/{banker_percent}")
-
-                # Require at least two values; ignore bogus single 100% readings
-                valid_count = sum(v is not None for v in [player_percent, banker_percent, tie_percent])
-                if valid_count >= 2 and player_percent is not None and banker_percent is not None and tie_percent is not None:
-                    stats = {
-                        'player_percent': player_percent,
-                        'banker_percent': banker_percent,
-                        'tie_percent': tie_percent,
-                        'player_winning': player_percent > 50,
-                        'timestamp': time.time(),
-                        'extraction_method': 'ocr'
-                    }
-                    logger.info(f"✅ OCR extraction successful: Player={player_percent}%, Banker={banker_percent:.1f}%, Tie={tie_percent:.1f}%")
-                    return stats
-                
-                logger.warning(f"OCR found percentages but couldn't match them: Player={player_percent}, Banker={banker_percent}, Tie={tie_percent}")
-                
-            finally:
-                # Restore original window size
-                try:
-                    self.driver.set_window_size(original_size['width'], original_size['height'])
-                except:
-                    pass
+
+            # Heuristic 2: If we can find any three percentages anywhere that sum ~100, take the most plausible triplet
+            if (player_percent is None or banker_percent is None or tie_percent is None) and len(all_percentages) >= 3:
+                nums = [val for val in map(int, all_percentages) if val <= 100]
+                # Sliding windows of three, prefer triplets where middle is smaller (tie usually lower);
+                # max() keeps the first of equally scored windows
+                best = max(
+                    (triplet for triplet in zip(nums, nums[1:], nums[2:]) if 90 <= sum(triplet) <= 110),
+                    key=lambda triplet: -abs(triplet[1] - min(triplet)),
+                    default=None
+                )
+                if best:
+                    p_val, t_val, b_val = best
+                    player_percent = player_percent if player_percent is not None else p_val
+                    tie_percent = tie_percent if tie_percent is not None else t_val
+                    banker_percent = banker_percent if banker_percent is not None else b_val
+                    logger.info(f"Selected best triplet P/T/B: {player_percent}/{tie_percent}/{banker_percent}")
+
+            # Require at least two values; ignore bogus single 100% readings
+            valid_count = sum(v is not None for v in [player_percent, banker_percent, tie_percent])
+            if valid_count >= 2 and player_percent is not None and banker_percent is not None and tie_percent is not None:
+                stats = Stats(
+                    player_percent=player_percent,
+                    banker_percent=banker_percent,
+                    tie_percent=tie_percent,
+                    player_winning=player_percent > 50,
+                    timestamp=time.time(),
+                    extraction_method='ocr'
+                )
+                self._ocr_memo = (digest, stats)
+                logger.info(f"✅ OCR extraction successful: Player={player_percent}%, Banker={banker_percent}%, Tie={tie_percent}%")
+                return stats
             
+            logger.warning(f"OCR found percentages but couldn't match them: Player={player_percent}, Banker={banker_percent}, Tie={tie_percent}")
             return None
             
         except Exception as e:
             logger.error(f"Error in OCR extraction: {e}", exc_info=True)
             return None
     
-    def get_betting_statistics(self) -> Optional[Dict]:
+    def get_betting_statistics(self) -> Optional[Stats]:
         """
         Extract betting statistics from the page
-        Returns dict with player_percent, banker_percent, tie_percent, and other data
+        Returns a Stats with player_percent, banker_percent, tie_percent, and other data
+        
+        Calls made while a scrape is running, or within _MIN_SCRAPE_INTERVAL of one
+        finishing, get that scrape's result instead of driving the browser again.
         """
+        with self._scrape_lock:
+            if self._last_scrape is not None and time.monotonic() - self._last_scrape[0] < _MIN_SCRAPE_INTERVAL:
+                return self._last_scrape[1]
+            stats = self._scrape_statistics()
+            self._last_scrape = (time.monotonic(), stats)
+            return stats
+    
+    def _scrape_statistics(self) -> Optional[Stats]:
         try:
             # Check if driver is valid
             if self.driver is None:
@@ -1061,15 +1344,11 @@ class BacBoScraper:
             try:
                 # Try to get current URL to verify driver is working
                 current_url = self.driver.current_url
-                logger.debug(f"Driver is valid, current URL: {current_url}")
+                logger.debug("Driver is valid, current URL: %s", current_url)
             except Exception as driver_error:
                 logger.error(f"Driver is invalid: {driver_error}, reinitializing...")
                 # Close old driver
-                try:
-                    self.driver.quit()
-                except:
-                    pass
-                self.driver = None
+                self._quit_driver()
                 self.start()
             
             # Verify we're on the correct page
@@ -1078,15 +1357,25 @@ class BacBoScraper:
                 logger.warning(f"Not on correct page, current URL: {current_url}, navigating...")
                 self.start()
             
-            # Wait for the betting statistics section to load
-            time.sleep(10)  # Give page more time to load dynamic content
+            # A short look for the statistics in the top document; the strategies below then share
+            # one deadline, so a page that never shows them costs _SCRAPE_BUDGET rather than 30s+
+            if self._wait_for_percent(_FIRST_PERCENT_WAIT):
+                logger.info("✅ Page contains percentage symbols")
+            else:
+                logger.warning("Page might not have loaded percentages yet")
+                # Try to see what text is actually on the page
+                try:
+                    body_text = self.driver.execute_script(_JS_BODY_TEXT)
+                    logger.info(f"Body text length: {len(body_text)}, sample: {body_text[:300]}")
+                except Exception:
+                    logger.error("Could not even get body text - page may not be loaded")
             
             # Diagnostic: Check what's actually on the page
             try:
-                page_text = self.driver.find_element(By.TAG_NAME, "body").text[:1000]
+                probe = self.driver.execute_script(_JS_PAGE_PROBE, 1000)
+                page_text = probe['text']
                 logger.info(f"Page text sample (first 1000 chars): {page_text[:500]}")
-                page_source_length = len(self.driver.page_source)
-                logger.info(f"Page source length: {page_source_length} characters")
+                logger.info(f"Page source length: {probe['html_length']} characters")
                 
                 # Check for common error indicators
                 if any(indicator in page_text.lower() for indicator in ['error', '404', 'not found', 'access denied', 'blocked']):
@@ -1095,290 +1384,12 @@ class BacBoScraper:
             except Exception as diag_error:
                 logger.error(f"Error during page diagnostics: {diag_error}")
             
-            # Try to wait for specific elements that might contain statistics
-            try:
-                # Wait for any element containing percentage
-                WebDriverWait(self.driver, 15).until(
-                    lambda d: '%' in d.find_element(By.TAG_NAME, "body").text
-                )
-                logger.info("✅ Page contains percentage symbols")
-            except Exception as wait_error:
-                logger.warning(f"Page might not have loaded percentages yet: {wait_error}")
-                # Try to see what text is actually on the page
-                try:
-                    body_text = self.driver.find_element(By.TAG_NAME, "body").text
-                    logger.info(f"Body text length: {len(body_text)}, sample: {body_text[:300]}")
-                except:
-                    logger.error("Could not even get body text - page may not be loaded")
-            
-            # PRIMARY METHOD: Use OCR to extract from screenshot (most reliable)
-            logger.info("Attempting OCR extraction from screenshot...")
-            stats = self._extract_stats_from_screenshot()
+            stats = self._try_strategies(time.monotonic() + _SCRAPE_BUDGET)
             if stats:
-                logger.info(f"✅ Successfully extracted stats using OCR: {stats}")
+                self._missed_scrapes = 0
                 return stats
             
-            logger.warning("OCR extraction failed, trying HTML/text extraction...")
-            
-            # FALLBACK METHOD: Try to extract from HTML/text
-            logger.debug("Attempting to extract stats from main page HTML/text...")
-            stats = self._extract_stats_from_context(self.driver)
-            if stats:
-                logger.info(f"Successfully extracted stats from main page: {stats}")
-                return stats
-            
-            # Wait longer for dynamic content that might load via JavaScript
-            logger.info("Waiting for dynamic content to load...")
-            time.sleep(5)
-            
-            # Try to wait for iframes to appear (they might load dynamically)
-            try:
-                WebDriverWait(self.driver, 20).until(
-                    lambda d: len(d.find_elements(By.TAG_NAME, "iframe")) > 0
-                )
-                logger.info("Iframes detected after waiting")
-            except:
-                logger.info("No iframes detected or they didn't load in time")
-            
-            # If not found, try to find and switch to iframe
-            # Casino games often load in iframes
-            try:
-                iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
-                logger.info(f"Found {len(iframes)} iframe(s)")
-                
-                # Also check for any nested iframes or shadow DOM
-                if len(iframes) == 0:
-                    logger.info("No iframes found, checking for shadow DOM or other containers...")
-                    # Try to find game containers
-                    game_containers = self.driver.find_elements(By.CSS_SELECTOR, "[id*='game'], [class*='game'], [id*='bac'], [class*='bac']")
-                    logger.info(f"Found {len(game_containers)} potential game containers")
-                
-                for idx, iframe in enumerate(iframes):
-                    try:
-                        logger.debug(f"Trying iframe {idx + 1}/{len(iframes)}...")
-                        # Scroll to iframe to ensure it's visible
-                        self.driver.execute_script("arguments[0].scrollIntoView(true);", iframe)
-                        time.sleep(2)
-                        
-                        # Try to switch to iframe
-                        self.driver.switch_to.frame(iframe)
-                        logger.debug("Switched to iframe, waiting for content...")
-                        time.sleep(5)  # Wait longer for iframe content to load
-                        
-                        # Debug: print some text from iframe to see what's there
-                        try:
-                            page_text = self.driver.find_element(By.TAG_NAME, "body").text[:500]
-                            logger.info(f"Iframe text sample (first 500 chars): {page_text}")
-                            
-                            # Also try to get all text using JavaScript
-                            try:
-                                js_text = self.driver.execute_script("return document.body.innerText;")
-                                if js_text and len(js_text) > 100:
-                                    logger.info(f"JavaScript extracted text sample: {js_text[:500]}")
-                            except:
-                                pass
-                            
-                            # Try to find elements with innerText or textContent
-                            try:
-                                # More comprehensive JavaScript extraction
-                                stats_data = self.driver.execute_script(r"""
-                                    var results = {
-                                        player: [],
-                                        banker: [],
-                                        tie: [],
-                                        all_texts: []
-                                    };
-                                    
-                                    // Get all elements
-                                    var all = document.querySelectorAll('*');
-                                    
-                                    for (var i = 0; i < all.length; i++) {
-                                        try {
-                                            var elem = all[i];
-                                            var text = elem.innerText || elem.textContent || '';
-                                            
-                                            if (text && text.length > 0 && text.length < 500) {
-                                                // Check for percentages
-                                                var percentMatch = text.match(/(\d+)%/g);
-                                                if (percentMatch) {
-                                                    var upperText = text.toUpperCase();
-                                                    
-                                                    // Check for player
-                                                    if (upperText.includes('JOGADOR') || upperText.includes('PLAYER')) {
-                                                        percentMatch.forEach(function(p) {
-                                                            var val = parseInt(p);
-                                                            if (val >= 0 && val <= 100) {
-                                                                results.player.push(val);
-                                                            }
-                                                        });
-                                                        results.all_texts.push(text.substring(0, 150));
-                                                    }
-                                                    
-                                                    // Check for banker
-                                                    if (upperText.includes('BANCA') || upperText.includes('BANKER')) {
-                                                        percentMatch.forEach(function(p) {
-                                                            var val = parseInt(p);
-                                                            if (val >= 0 && val <= 100) {
-                                                                results.banker.push(val);
-                                                            }
-                                                        });
-                                                    }
-                                                    
-                                                    // Check for tie
-                                                    if (upperText.includes('EMPATE') || upperText.includes('TIE')) {
-                                                        percentMatch.forEach(function(p) {
-                                                            var val = parseInt(p);
-                                                            if (val >= 0 && val <= 100) {
-                                                                results.tie.push(val);
-                                                            }
-                                                        });
-                                                    }
-                                                }
-                                            }
-                                        } catch(e) {}
-                                    }
-                                    
-                                    // Also search in page source
-                                    var pageSource = document.documentElement.innerHTML;
-                                    var sourceUpper = pageSource.toUpperCase();
-                                    
-                                    // Find all percentages in source
-                                    var allPercents = pageSource.match(/(\d+)%/g);
-                                    if (allPercents) {
-                                        for (var j = 0; j < allPercents.length; j++) {
-                                            var percentStr = allPercents[j];
-                                            var val = parseInt(percentStr);
-                                            if (val >= 0 && val <= 100) {
-                                                var idx = pageSource.indexOf(percentStr);
-                                                if (idx >= 0) {
-                                                    var context = pageSource.substring(Math.max(0, idx-100), Math.min(pageSource.length, idx+100)).toUpperCase();
-                                                    
-                                                    if (context.includes('JOGADOR') || context.includes('PLAYER')) {
-                                                        results.player.push(val);
-                                                    }
-                                                    if (context.includes('BANCA') || context.includes('BANKER')) {
-                                                        results.banker.push(val);
-                                                    }
-                                                    if (context.includes('EMPATE') || context.includes('TIE')) {
-                                                        results.tie.push(val);
-                                                    }
-                                                }
-                                            }
-                                        }
-                                    }
-                                    
-                                    return results;
-                                """)
-                                
-                                if stats_data:
-                                    logger.info(f"JavaScript extraction results: Player={stats_data.get('player', [])}, Banker={stats_data.get('banker', [])}, Tie={stats_data.get('tie', [])}")
-                                    if stats_data.get('all_texts'):
-                                        logger.info(f"Sample texts found: {stats_data.get('all_texts', [])[:3]}")
-                                    
-                                    # Add to candidates
-                                    if stats_data.get('player'):
-                                        player_candidates.extend([v for v in stats_data['player'] if v not in player_candidates])
-                                    if stats_data.get('banker'):
-                                        banker_candidates.extend([v for v in stats_data['banker'] if v not in banker_candidates])
-                                    if stats_data.get('tie'):
-                                        tie_candidates.extend([v for v in stats_data['tie'] if v not in tie_candidates])
-                                    
-                                    logger.info(f"After JavaScript: Player candidates: {player_candidates}, Banker: {banker_candidates}, Tie: {tie_candidates}")
-                                    
-                                    # Recalculate percentages after JavaScript extraction
-                                    if player_candidates:
-                                        player_percent = max(set(player_candidates), key=player_candidates.count)
-                                    if banker_candidates:
-                                        banker_percent = max(set(banker_candidates), key=banker_candidates.count)
-                                    if tie_candidates:
-                                        tie_percent = max(set(tie_candidates), key=tie_candidates.count)
-                                    
-                            except Exception as js_error:
-                                logger.debug(f"JavaScript extraction error: {js_error}")
-                        except:
-                            pass
-                        
-                        # Try extraction from iframe with updated candidates from JavaScript
-                        stats = self._extract_stats_from_context(
-                            self.driver, 
-                            player_candidates=player_candidates,
-                            banker_candidates=banker_candidates,
-                            tie_candidates=tie_candidates
-                        )
-                        if stats:
-                            logger.info(f"Successfully extracted stats from iframe {idx + 1}: {stats}")
-                            self.driver.switch_to.default_content()
-                            return stats
-                        
-                        # Also try extracting fresh from iframe context
-                        stats = self._extract_stats_from_context(self.driver)
-                        if stats:
-                            logger.info(f"Successfully extracted stats from iframe {idx + 1} (fresh extraction): {stats}")
-                            self.driver.switch_to.default_content()
-                            return stats
-                        
-                        # Try waiting for specific elements that might contain stats
-                        try:
-                            # Look for common betting statistics containers
-                            stat_containers = self.driver.find_elements(By.XPATH, 
-                                "//*[contains(@class, 'stat') or contains(@class, 'bet') or contains(@id, 'stat') or contains(@id, 'bet')]")
-                            logger.debug(f"Found {len(stat_containers)} potential stat containers in iframe")
-                            
-                            for container in stat_containers[:10]:  # Check first 10
-                                try:
-                                    text = container.text
-                                    if text and ('%' in text or 'JOGADOR' in text.upper() or 'PLAYER' in text.upper()):
-                                        logger.debug(f"Found potential stat container: {text[:100]}")
-                                except:
-                                    pass
-                        except Exception as e:
-                            logger.debug(f"Error checking stat containers: {e}")
-                        
-                        self.driver.switch_to.default_content()
-                    except Exception as e:
-                        logger.warning(f"Error switching to iframe {idx + 1}: {e}")
-                        try:
-                            self.driver.switch_to.default_content()
-                        except:
-                            pass
-            except Exception as e:
-                logger.warning(f"Error checking iframes: {e}")
-            
-            # Try one more time with a longer wait and refresh
-            logger.info("Retrying extraction with longer wait...")
-            time.sleep(5)
-            
-            # Try refreshing the page content
-            try:
-                self.driver.refresh()
-                time.sleep(8)
-                stats = self._extract_stats_from_context(self.driver)
-                if stats:
-                    logger.info(f"Successfully extracted stats after refresh: {stats}")
-                    return stats
-            except:
-                pass
-            
-            # Last attempt: try iframes again with even longer wait
-            try:
-                iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
-                for iframe in iframes:
-                    try:
-                        self.driver.switch_to.frame(iframe)
-                        time.sleep(10)  # Even longer wait
-                        stats = self._extract_stats_from_context(self.driver)
-                        if stats:
-                            self.driver.switch_to.default_content()
-                            return stats
-                        self.driver.switch_to.default_content()
-                    except:
-                        try:
-                            self.driver.switch_to.default_content()
-                        except:
-                            pass
-            except:
-                pass
-            
+            self._missed_scrapes += 1
             logger.warning("Could not extract betting statistics after all attempts")
             
             # Capture screenshot for debugging
@@ -1389,96 +1400,6 @@ class BacBoScraper:
             except Exception as screenshot_error:
                 logger.warning(f"Could not save debug screenshot: {screenshot_error}")
             
-            # Try JavaScript-based detection as last resort
-            try:
-                logger.info("Attempting JavaScript-based detection...")
-                js_result = self.driver.execute_script("""
-                    // Try to find any elements with percentages
-                    var allElements = document.querySelectorAll('*');
-                    var found = {
-                        player: [],
-                        banker: [],
-                        tie: [],
-                        allTexts: []
-                    };
-                    
-                    for (var i = 0; i < allElements.length; i++) {
-                        var elem = allElements[i];
-                        var text = elem.innerText || elem.textContent || '';
-                        if (text && text.length > 0 && text.length < 500) {
-                            var upper = text.toUpperCase();
-                            var matches = text.match(/(\\d+)%/g);
-                            
-                            if (matches) {
-                                if (upper.includes('JOGADOR') || upper.includes('PLAYER')) {
-                                    matches.forEach(m => {
-                                        var num = parseInt(m);
-                                        if (num >= 0 && num <= 100) found.player.push(num);
-                                    });
-                                }
-                                if (upper.includes('BANCA') || upper.includes('BANKER')) {
-                                    matches.forEach(m => {
-                                        var num = parseInt(m);
-                                        if (num >= 0 && num <= 100) found.banker.push(num);
-                                    });
-                                }
-                                if (upper.includes('EMPATE') || upper.includes('TIE')) {
-                                    matches.forEach(m => {
-                                        var num = parseInt(m);
-                                        if (num >= 0 && num <= 100) found.tie.push(num);
-                                    });
-                                }
-                            }
-                        }
-                    }
-                    
-                    return found;
-                """)
-                
-                if js_result:
-                    logger.info(f"JavaScript detection found: {js_result}")
-                    player_vals = js_result.get('player', [])
-                    banker_vals = js_result.get('banker', [])
-                    tie_vals = js_result.get('tie', [])
-                    
-                    if player_vals and banker_vals:
-                        player_percent = max(set(player_vals), key=player_vals.count) if player_vals else None
-                        banker_percent = max(set(banker_vals), key=banker_vals.count) if banker_vals else None
-                        tie_percent = max(set(tie_vals), key=tie_vals.count) if tie_vals else (100 - (player_percent or 0) - (banker_percent or 0))
-                        
-                        if player_percent is not None and banker_percent is not None:
-                            stats = {
-                                'player_percent': player_percent,
-                                'banker_percent': banker_percent,
-                                'tie_percent': tie_percent if tie_percent >= 0 else 0,
-                                'player_winning': player_percent > 50,
-                                'timestamp': time.time(),
-                                'extraction_method': 'javascript_fallback'
-                            }
-                            logger.info(f"✅ Successfully extracted stats using JavaScript fallback: {stats}")
-                            return stats
-            except Exception as js_error:
-                logger.error(f"JavaScript detection failed: {js_error}")
-            
-            # Try refreshing the page and retrying once
-            try:
-                logger.info("Attempting page refresh and retry...")
-                self.driver.refresh()
-                time.sleep(15)  # Wait longer after refresh
-                
-                # Try extraction again after refresh
-                stats = self._extract_stats_from_screenshot()
-                if stats:
-                    logger.info(f"✅ Successfully extracted stats after refresh using OCR: {stats}")
-                    return stats
-                
-                stats = self._extract_stats_from_context(self.driver)
-                if stats:
-                    logger.info(f"✅ Successfully extracted stats after refresh from HTML: {stats}")
-                    return stats
-            except Exception as refresh_error:
-                logger.error(f"Error during refresh retry: {refresh_error}")
-            
             return None
             
         except Exception as e:
@@ -1490,31 +1411,412 @@ class BacBoScraper:
                     current_url = self.driver.current_url
                     page_title = self.driver.title
                     logger.error(f"Error context - URL: {current_url}, Title: {page_title}")
-            except:
+            except WebDriverException:
                 pass
             
             # Try to reinitialize driver if it's a driver-related error
             if 'session' in str(e).lower() or 'driver' in str(e).lower() or 'chrome' in str(e).lower():
                 logger.warning("Driver error detected, attempting to reinitialize...")
-                try:
-                    if self.driver:
-                        self.driver.quit()
-                except:
-                    pass
-                self.driver = None
+                self._quit_driver()
                 # Don't retry immediately to avoid infinite loop, just return None
             return None
     
+    def _try_strategies(self, deadline: float) -> Optional[Stats]:
+        """Run the extraction strategies in order until one returns stats or the deadline passes.
+
+        The default document and the iframes are always tried (with at least a short wait each);
+        the deadline only cuts off the later fallbacks, except a reload that is due.
+        """
+        strategies = (
+            self._extract_default,
+            self._extract_from_iframes,
+            self._extract_with_javascript,
+            self._refresh_and_extract,
+        )
+        for position, strategy in enumerate(strategies):
+            if position >= 2 and time.monotonic() >= deadline and not (
+                    strategy == self._refresh_and_extract and self._refresh_due()):
+                logger.warning("Scrape budget of %ss used up before %s", _SCRAPE_BUDGET, strategy.__name__)
+                break
+            stats = strategy(deadline)
+            if stats:
+                return stats
+        return None
+    
+    def _extract_default(self, deadline: float) -> Optional[Stats]:
+        """OCR the viewport, then classify the main document's text"""
+        # PRIMARY METHOD: Use OCR to extract from screenshot (most reliable)
+        logger.info("Attempting OCR extraction from screenshot...")
+        stats = self._extract_stats_from_screenshot()
+        if stats:
+            logger.info(f"✅ Successfully extracted stats using OCR: {stats}")
+            return stats
+        
+        logger.warning("OCR extraction failed, trying HTML/text extraction...")
+        
+        # FALLBACK METHOD: Try to extract from HTML/text
+        logger.debug("Attempting to extract stats from main page HTML/text...")
+        stats = self._extract_stats_from_context(self.driver)
+        if stats:
+            logger.info(f"Successfully extracted stats from main page: {stats}")
+        return stats
+    
+    def _extract_from_iframes(self, deadline: float) -> Optional[Stats]:
+        """Classify the text of each iframe, giving each one what is left of the budget (at most 5s)"""
+        # Try to wait for iframes to appear (they might load dynamically)
+        try:
+            WebDriverWait(self.driver, min(_IFRAME_WAIT, _remaining(deadline))).until(
+                lambda d: len(d.find_elements(By.TAG_NAME, "iframe")) > 0
+            )
+            logger.info("Iframes detected after waiting")
+        except WebDriverException:  # Includes the wait's TimeoutException
+            logger.info("No iframes detected or they didn't load in time")
+        
+        # If not found, try to find and switch to iframe
+        # Casino games often load in iframes
+        try:
+            iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
+            logger.info(f"Found {len(iframes)} iframe(s)")
+            
+            # Also check for any nested iframes or shadow DOM
+            if len(iframes) == 0:
+                logger.info("No iframes found, checking for shadow DOM or other containers...")
+                # Try to find game containers
+                game_containers = self.driver.find_elements(By.CSS_SELECTOR, "[id*='game'], [class*='game'], [id*='bac'], [class*='bac']")
+                logger.info(f"Found {len(game_containers)} potential game containers")
+            
+            for idx, iframe in enumerate(iframes):
+                if idx > 0 and time.monotonic() >= deadline:
+                    logger.info("Scrape budget used up after %s/%s iframe(s)", idx, len(iframes))
+                    break
+                try:
+                    logger.debug("Trying iframe %s/%s...", idx + 1, len(iframes))
+                    # Scroll to iframe to ensure it's visible
+                    self.driver.execute_script("arguments[0].scrollIntoView(true);", iframe)
+                    
+                    # Try to switch to iframe; returns as soon as its content shows a percentage
+                    self._enter_frame(iframe, min(5, _remaining(deadline)))
+                    logger.debug("Switched to iframe")
+                    
+                    # Debug: print some text from iframe to see what's there (the second, full
+                    # innerText fetch only ever logged these same first 500 chars)
+                    try:
+                        page_text = self.driver.execute_script(_JS_BODY_TEXT, 500)
+                        logger.info(f"Iframe text sample (first 500 chars): {page_text}")
+                    except WebDriverException:
+                        pass
+                    
+                    # Same in-browser classification as the main page, now run inside the iframe
+                    stats = self._extract_stats_from_context(self.driver)
+                    if stats:
+                        logger.info(f"Successfully extracted stats from iframe {idx + 1}: {stats}")
+                        self.driver.switch_to.default_content()
+                        return stats
+                    
+                    # Try waiting for specific elements that might contain stats
+                    # The probe only feeds debug output, so skip its round trips otherwise
+                    if logger.isEnabledFor(logging.DEBUG):
+                        try:
+                            # One lookup that already filters on text, then all the texts in one more call
+                            stat_containers = self.driver.find_elements(By.XPATH, _STAT_CONTAINER_XPATH)
+                            logger.debug("Found %s potential stat containers in iframe", len(stat_containers))
+                            if stat_containers:
+                                for text in self.driver.execute_script(_JS_ELEMENTS_TEXT, stat_containers):
+                                    logger.debug("Found potential stat container: %s", text[:100])
+                        except Exception as e:
+                            logger.debug("Error checking stat containers: %s", e)
+                    
+                    self.driver.switch_to.default_content()
+                except Exception as e:
+                    logger.warning(f"Error switching to iframe {idx + 1}: {e}")
+                    try:
+                        self.driver.switch_to.default_content()
+                    except WebDriverException:
+                        pass
+        except Exception as e:
+            logger.warning(f"Error checking iframes: {e}")
+        return None
+    
+    def _extract_with_javascript(self, deadline: float) -> Optional[Stats]:
+        """Last in-page resort: the same classification as the context pass, without the page HTML"""
+        try:
+            logger.info("Attempting JavaScript-based detection...")
+            js_result = self.driver.execute_script(_JS_CLASSIFY_TEXT, False)
+            
+            if js_result:
+                logger.info(f"JavaScript detection found: Player={js_result['player']}, Banker={js_result['banker']}, Tie={js_result['tie']}")
+                player_vals = js_result.get('player', [])
+                banker_vals = js_result.get('banker', [])
+                tie_vals = js_result.get('tie', [])
+                
+                if player_vals and banker_vals:
+                    player_percent = _most_common(player_vals) if player_vals else None
+                    banker_percent = _most_common(banker_vals) if banker_vals else None
+                    tie_percent = _most_common(tie_vals) if tie_vals else (100 - (player_percent or 0) - (banker_percent or 0))
+                    
+                    if player_percent is not None and banker_percent is not None:
+                        stats = Stats(
+                            player_percent=player_percent,
+                            banker_percent=banker_percent,
+                            tie_percent=tie_percent if tie_percent >= 0 else 0,
+                            player_winning=player_percent > 50,
+                            timestamp=time.time(),
+                            extraction_method='javascript_fallback'
+                        )
+                        logger.info(f"✅ Successfully extracted stats using JavaScript fallback: {stats}")
+                        return stats
+        except Exception as js_error:
+            logger.error(f"JavaScript detection failed: {js_error}")
+        return None
+    
+    def _refresh_due(self) -> bool:
+        """Whether this scrape, if it misses too, completes _REFRESH_AFTER_MISSES misses in a row"""
+        return self._missed_scrapes + 1 >= _REFRESH_AFTER_MISSES
+    
+    def _refresh_and_extract(self, deadline: float) -> Optional[Stats]:
+        """Reload the page and try again, but only once stats have been missing for a few scrapes in a row.
+
+        A reload brings the game iframe and its ads back from scratch, the most expensive step
+        on this path, and a single miss is usually just a round changing over.
+        """
+        if not self._refresh_due():
+            logger.debug("Skipping page refresh (%s consecutive miss(es) so far)", self._missed_scrapes)
+            return None
+        try:
+            logger.info("Attempting page refresh and retry...")
+            self.driver.refresh()
+            self._missed_scrapes = 0
+            # A reload that is due runs past the scrape budget, so it gets its own wait
+            self._wait_for_percent(max(_remaining(deadline), _REFRESH_WAIT))
+            
+            # Try extraction again after refresh
+            stats = self._extract_stats_from_screenshot()
+            if stats:
+                logger.info(f"✅ Successfully extracted stats after refresh using OCR: {stats}")
+                return stats
+            
+            stats = self._extract_stats_from_context(self.driver)
+            if stats:
+                logger.info(f"✅ Successfully extracted stats after refresh from HTML: {stats}")
+                return stats
+        except Exception as refresh_error:
+            logger.error(f"Error during refresh retry: {refresh_error}")
+        return None
+    
     def refresh(self):
         """Refresh the page"""
+        self._last_scrape = None
+        self._missed_scrapes = 0
         if self.driver:
+            # A crashed or half-navigated page may have no body; the reload still has to run
+            try:
+                old_body = self.driver.find_element(By.TAG_NAME, "body")
+            except WebDriverException:
+                old_body = None
             self.driver.refresh()
-            time.sleep(5)
+            # Done once the old document is gone (or, without one to watch, the new one has
+            # loaded) and the new one has a body; the next scrape waits for the statistics themselves
+            try:
+                if old_body is not None:
+                    WebDriverWait(self.driver, 8).until(EC.staleness_of(old_body))
+                else:
+                    WebDriverWait(self.driver, 8).until(
+                        lambda d: d.execute_script('return document.readyState') == 'complete'
+                    )
+                WebDriverWait(self.driver, 5).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+            except TimeoutException:
+                logger.debug("Page did not finish reloading within the refresh wait")
             self._switch_language(self.current_language)
     
     def close(self):
-        """Close the browser"""
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
+        """Release the browser: park it (on a blank page) for the next scraper; _shutdown() quits it"""
+        if not self.driver:
+            self._quit_driver()  # Drops a profile lock left by a launch that failed
+            return
+        try:
+            self.driver.get('about:blank')  # Stop the game page streaming while parked
+        except Exception:
+            logger.debug("Chrome session unusable, quitting instead of parking", exc_info=True)
+            self._quit_driver()
+            return
+        # The parked session keeps the profile lock; whoever claims it takes the lock too
+        parked = (self.driver, self._profile_lock)
+        self.driver, self._profile_lock = None, None
+        with BacBoScraper._shared_driver_lock:
+            previous, BacBoScraper._shared_driver = BacBoScraper._shared_driver, parked
+        if previous is not None:
+            try:
+                previous[0].quit()
+            except Exception:
+                logger.debug("Error quitting previously parked Chrome session", exc_info=True)
+            _release_profile_lock(previous[1])
+
+
+atexit.register(BacBoScraper._shutdown)
+
+
+
+def _scraper_worker(conn, url: str, headless: bool, wait_timeout: int):
+    """Child-process loop: own a BacBoScraper and run the method names sent over conn until it is closed"""
+    configure_logging()
+    scraper = BacBoScraper(url=url, headless=headless, wait_timeout=wait_timeout)
+    try:
+        while True:
+            try:
+                command = conn.recv()
+            except EOFError:
+                break
+            try:
+                conn.send((True, getattr(scraper, command)()))
+            except Exception as e:
+                # Selenium exceptions don't always pickle, send the message instead
+                conn.send((False, f"{type(e).__name__}: {e}"))
+    finally:
+        # Spawned children exit without running atexit, so quit Chrome explicitly
+        scraper.close()
+        BacBoScraper._shutdown()
+        conn.close()
+
+
+# Seconds the parent waits for the child to answer a command before killing it as hung;
+# start() can retry the page load several times, a scrape is bounded by _SCRAPE_BUDGET, a due
+# reload and OCR, and a respawned child runs start() inside its first scrape
+_CHILD_START_TIMEOUT = 300
+_CHILD_COMMAND_TIMEOUT = 120
+_CHILD_COMMAND_TIMEOUTS = {
+    'start': _CHILD_START_TIMEOUT,
+    'get_betting_statistics': _CHILD_START_TIMEOUT + _CHILD_COMMAND_TIMEOUT,
+    'refresh': 60,
+}
+
+
+def _stop_child(proc, conn, timeout: float = 15):
+    """Close the pipe (the worker quits Chrome on EOF) and reap the child, killing it if it hangs"""
+    conn.close()
+    proc.join(timeout)
+    if proc.is_alive():
+        proc.kill()
+        proc.join()
+
+
+class ScraperProcess:
+    """BacBoScraper running in a child process, with the same start/get_betting_statistics/refresh/close interface.
+
+    Driver round-trips, DOM parsing and OCR then hold the child's GIL instead
+    of competing with the web server's event loop for this one. A closed proxy
+    parks its child (and the Chrome session inside it) for the next proxy.
+    """
+    
+    _shared_child = None  # (process, connection, scraper args)
+    _shared_child_lock = threading.Lock()
+    
+    def __init__(self, url: str, headless: bool = True, wait_timeout: int = 30):
+        self.url = url
+        self.headless = headless
+        self.wait_timeout = wait_timeout
+        self._proc = None
+        self._conn = None
+        self._lock = threading.Lock()
+        # Set by close() so a late call does not spawn a child nobody will close
+        self._closed = False
+    
+    def _ensure_child(self):
+        """Claim the parked child or spawn one (spawn is safe with the threads this process already runs)"""
+        if self._proc is not None and self._proc.is_alive():
+            return
+        if self._proc is not None:
+            logger.warning("Scraper process exited (code %s), starting a new one", self._proc.exitcode)
+            _stop_child(self._proc, self._conn)
+        args = (self.url, self.headless, self.wait_timeout)
+        with ScraperProcess._shared_child_lock:
+            child, ScraperProcess._shared_child = ScraperProcess._shared_child, None
+        if child is not None and child[0].is_alive() and child[2] == args:
+            self._proc, self._conn = child[0], child[1]
+            return
+        if child is not None:
+            _stop_child(child[0], child[1])
+        ctx = multiprocessing.get_context('spawn')
+        self._conn, child_conn = ctx.Pipe()
+        self._proc = ctx.Process(
+            target=_scraper_worker,
+            args=(child_conn, *args),
+            name='bacbo-scraper',
+            daemon=True
+        )
+        self._proc.start()
+        child_conn.close()
+    
+    def _call(self, command: str):
+        """Run command in the child, respawning it first if it has died.
+
+        A child that dies mid-call or does not answer within the command's timeout is
+        killed; the call raises and the next one starts a fresh child (whose scraper
+        opens the site again on its first scrape).
+        """
+        timeout = _CHILD_COMMAND_TIMEOUTS.get(command, _CHILD_COMMAND_TIMEOUT)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Scraper process is not running")
+            self._ensure_child()
+            try:
+                self._conn.send(command)
+                if not self._conn.poll(timeout):
+                    raise TimeoutError(f"no answer to {command} within {timeout}s")
+                ok, result = self._conn.recv()
+            except (EOFError, OSError) as e:  # OSError covers BrokenPipeError and TimeoutError
+                logger.error("Scraper process failed during %s: %s", command, e)
+                _stop_child(self._proc, self._conn, timeout=5)
+                self._proc = self._conn = None
+                raise RuntimeError(f"Scraper process failed during {command}: {e}") from e
+        if not ok:
+            raise RuntimeError(result)
+        return result
+    
+    def start(self):
+        """Claim the parked child or spawn one, then open the site"""
+        self._closed = False
+        return self._call('start')
+    
+    def get_betting_statistics(self) -> Optional[Stats]:
+        return self._call('get_betting_statistics')
+    
+    def refresh(self):
+        return self._call('refresh')
+    
+    def close(self, timeout: float = 15):
+        """Release the browser in the child and park the child; one that fails or does not answer in time is killed"""
+        with self._lock:
+            self._closed = True
+            proc, conn = self._proc, self._conn
+            if proc is None:
+                return
+            self._proc = None
+            self._conn = None
+            parked = False
+            try:
+                conn.send('close')
+                if conn.poll(timeout):
+                    parked, result = conn.recv()
+                    if not parked:
+                        logger.warning("Scraper close failed in the child: %s", result)
+            except (OSError, EOFError):
+                logger.debug("Scraper process already gone", exc_info=True)
+        if not parked:
+            _stop_child(proc, conn, timeout)
+            return
+        with ScraperProcess._shared_child_lock:
+            previous = ScraperProcess._shared_child
+            ScraperProcess._shared_child = (proc, conn, (self.url, self.headless, self.wait_timeout))
+        if previous is not None:
+            _stop_child(previous[0], previous[1], timeout)
+    
+    @classmethod
+    def _shutdown(cls):
+        """End the parked child (registered with atexit, ahead of multiprocessing's own terminate)"""
+        with cls._shared_child_lock:
+            child, cls._shared_child = cls._shared_child, None
+        if child is not None:
+            _stop_child(child[0], child[1])
+
 
+atexit.register(ScraperProcess._shutdown)
@@ -2,14 +2,36 @@
 Telegram bot for sending Bac Bo game alerts
 """
 from telegram import Bot
-from telegram.error import TelegramError
+from telegram.constants import MessageLimit
+from telegram.error import BadRequest, NetworkError, RetryAfter, TimedOut
 import logging
 import asyncio
+import concurrent.futures
 import threading
-from typing import Dict, Optional
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    from scraper import Stats
 
 logger = logging.getLogger(__name__)
 
+# Outbound message queue tuning
+OUTBOX_MAXSIZE = 256  # messages held while Telegram is slow before new ones are dropped
+OUTBOX_SEND_INTERVAL = 0.05  # seconds between queued sends
+OUTBOX_COALESCE_WINDOW = 0.2  # seconds to let a burst of messages gather before sending it as one
+# Kinds that only report current state: one identical to the last delivered of its kind is not
+# sent again until DEDUPE_REPEAT_AFTER seconds have passed, so a standing problem is still reported
+DEDUPE_KINDS = frozenset(('status', 'scoreboard'))
+DEDUPE_REPEAT_AFTER = 120
+# Kinds that may share one Telegram message with their neighbours in a burst; alerts and round
+# results always go out alone, so each gets its own notification and its own delivery outcome
+MERGE_KINDS = frozenset(('status', 'scoreboard', 'message'))
+SEND_RETRY_ATTEMPTS = 3  # tries per message on timeouts and connection errors
+SEND_RETRY_BASE = 0.5  # seconds before the first retry, doubled after each failure
+
 # Use a single shared event loop for all Telegram operations to avoid connection pool issues
 _shared_loop = None
 _loop_lock = threading.Lock()
@@ -37,111 +59,239 @@ def _get_shared_loop():
         
         return _shared_loop
 
-def _run_async(coro):
-    """Run async coroutine using shared event loop"""
-    import concurrent.futures
+def _submit_async(coro):
+    """Schedule coroutine on the shared event loop and return its concurrent future"""
+    return asyncio.run_coroutine_threadsafe(coro, _get_shared_loop())
+
+async def _call_with_retry(factory, attempts: int = SEND_RETRY_ATTEMPTS, base: float = SEND_RETRY_BASE):
+    """Await factory(), retrying with exponential backoff on transient network errors.
+
+    BadRequest subclasses NetworkError in PTB but fails the same way again, so it is
+    raised at once, like Forbidden and the other TelegramErrors. Flood control
+    (RetryAfter) waits the retry_after Telegram asks for instead of the backoff.
+    """
+    for attempt in range(attempts):
+        try:
+            return await factory()
+        except BadRequest:
+            raise
+        except RetryAfter as e:
+            if attempt == attempts - 1:
+                raise
+            logger.warning("Telegram flood control, retrying in %ss", e.retry_after)
+            await asyncio.sleep(e.retry_after)
+        except (TimedOut, NetworkError) as e:
+            if attempt == attempts - 1:
+                raise
+            delay = base * 2 ** attempt
+            logger.warning("Telegram request failed (%s), retrying in %ss", e, delay)
+            await asyncio.sleep(delay)
+
+@lru_cache(maxsize=None)
+def _shared_request(connection_pool_size: int, read_timeout: float, write_timeout: float = None,
+                    connect_timeout: float = None, pool_timeout: float = None, http_version: str = "1.1"):
+    """One HTTPXRequest per distinct configuration, shared by every Bot in the process.
+
+    A bot started after a /stop reuses the open connections (and HTTP/2 session) to
+    api.telegram.org instead of handshaking again. All of them run on the shared loop.
+    """
+    from telegram.request import HTTPXRequest
+    return HTTPXRequest(
+        connection_pool_size=connection_pool_size,
+        read_timeout=read_timeout,
+        write_timeout=write_timeout,
+        connect_timeout=connect_timeout,
+        pool_timeout=pool_timeout,
+        http_version=http_version
+    )
+
+def _merge_items(items):
+    """Join consecutive MERGE_KINDS (kind, text, delivery) items with blank lines into as few messages as
+    Telegram's length limit allows; returns (text, items in it) per message"""
+    merged = []
+    for item in items:
+        text = item[1]
+        if (merged and item[0] in MERGE_KINDS and merged[-1][1][-1][0] in MERGE_KINDS
+                and len(merged[-1][0]) + 2 + len(text) <= MessageLimit.MAX_TEXT_LENGTH):
+            merged[-1] = (f"{merged[-1][0]}\n\n{text}", merged[-1][1] + [item])
+        else:
+            merged.append((text, [item]))
+    return merged
+
+
+@dataclass(slots=True)
+class BacBoStats:
+    """Running win/loss tally for the scoreboard; record_win/record_loss keep the rate current"""
+    wins: int = 0
+    losses: int = 0
+    ties: int = 0
+    consecutive_wins: int = 0
+    last_result: Optional[str] = None
+    _rate: float = field(default=100.0, init=False, repr=False)
+    
+    @property
+    def assertiveness(self) -> float:
+        """Wins as a percentage of decided rounds (100.0 before the first one)"""
+        return self._rate
     
-    loop = _get_shared_loop()
+    def record_win(self):
+        self.wins += 1
+        self.consecutive_wins += 1
+        self.last_result = 'win'
+        self._update_rate()
     
-    # Schedule the coroutine on the shared loop
-    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    def record_loss(self):
+        self.losses += 1
+        self.consecutive_wins = 0
+        self.last_result = 'loss'
+        self._update_rate()
     
-    try:
-        # Wait for result with timeout
-        return future.result(timeout=30)
-    except concurrent.futures.TimeoutError:
-        logger.error("Telegram message send timed out")
-        future.cancel()
-        raise
-    except Exception as e:
-        logger.error(f"Error in async execution: {e}")
-        future.cancel()
-        raise
+    def _update_rate(self):
+        self._rate = self.wins / (self.wins + self.losses) * 100
 
 
 class BacBoTelegramBot:
     """Telegram bot for Bac Bo alerts"""
     
-    def __init__(self, token: str, chat_id: str):
+    # Message templates by language; anything other than 'pt' gets English
+    _SCOREBOARD_TMPL = {
+        'pt': (
+            "PLACAR\n"
+            "✓ :{wins}\n"
+            "🟢 :{losses}\n"
+            "🔴 :{ties}\n"
+            "📊 GANHOS SEGUIDOS: {cw}\n"
+            "🎯 TAXA DE ASSERTIVIDADE: {rate:.2f}%"
+        ),
+        'en': (
+            "SCOREBOARD\n"
+            "✓ :{wins}\n"
+            "🟢 :{losses}\n"
+            "🔴 :{ties}\n"
+            "📊 CONSECUTIVE WINS: {cw}\n"
+            "🎯 ASSERTIVENESS RATE: {rate:.2f}%"
+        ),
+    }
+    _ENTRY_TMPL = {
+        'pt': (
+            "ENTRADA CONFIRMADA\n"
+            "🎲 ENTRAR NA COR ({color})\n"
+            "🎯 PROTEGER NO EMPATE ({tie})\n"
+            "💰💰🤖 Entrar No Jogo"
+        ),
+        'en': (
+            "CONFIRMED ENTRY\n"
+            "🎲 ENTER THE COLOR ({color})\n"
+            "🎯 PROTECT ON TIE ({tie})\n"
+            "💰💰🤖 Enter The Game"
+        ),
+    }
+    # Both colors (red circle for player, blue for banker) in both languages; the tie is always green
+    _ENTRY_MESSAGES = {
+        (color, lang): tmpl.format(color=emoji, tie='🟢')
+        for lang, tmpl in _ENTRY_TMPL.items()
+        for color, emoji in (('red', '🔴'), ('blue', '🔵'))
+    }
+    _STARTUP_MESSAGES = {
+        'pt': "🤖 Bot Bac Bo iniciado!\n\n📊 Monitorando o jogo...\n⏱️ Intervalo de verificação: 5 segundos\n🎯 Limite de alerta: Player > 98%",
+        'en': "🤖 Bac Bo Bot Started!\n\n📊 Monitoring game...\n⏱️ Check interval: 5 seconds\n🎯 Alert threshold: Player > 98%",
+    }
+    _SHUTDOWN_MESSAGES = {
+        'pt': "🛑 Bot Bac Bo finalizado!\n\nO bot foi encerrado.",
+        'en': "🛑 Bac Bo Bot Stopped!\n\nThe bot has been shut down.",
+    }
+    _STATUS_TMPL = {
+        'pt': (
+            "📊 Status Atual\n\n"
+            "👤 Jogador: {player}%\n"
+            "🏦 Banca: {banker}%\n"
+            "🤝 Empate: {tie}%\n\n"
+            "{verdict}"
+        ),
+        'en': (
+            "📊 Current Status\n\n"
+            "👤 Player: {player}%\n"
+            "🏦 Banker: {banker}%\n"
+            "🤝 Tie: {tie}%\n\n"
+            "{verdict}"
+        ),
+    }
+    # (alert condition met, still waiting)
+    _STATUS_VERDICTS = {
+        'pt': ('✅ Condição de alerta ativada!', '⏳ Aguardando condição favorável...'),
+        'en': ('✅ Alert condition met!', '⏳ Waiting for favorable condition...'),
+    }
+    _NO_STATS_MESSAGES = {
+        'pt': (
+            "⚠️ Não foi possível obter estatísticas do jogo.\n\n"
+            "Possíveis causas:\n"
+            "• Site pode estar bloqueando acesso automatizado\n"
+            "• Página pode não estar carregando completamente\n"
+            "• Conteúdo do jogo pode estar em iframe não detectado\n\n"
+            "O bot continua monitorando..."
+        ),
+        'en': (
+            "⚠️ Could not retrieve game statistics.\n\n"
+            "Possible causes:\n"
+            "• Site may be blocking automated access\n"
+            "• Page may not be loading completely\n"
+            "• Game content may be in undetected iframe\n\n"
+            "The bot continues monitoring..."
+        ),
+    }
+    
+    def __init__(self, token: str, chat_id: str, request=None, get_updates_request=None):
         self.token = token
         self.chat_id = chat_id
         # Configure Bot with larger connection pool to avoid timeout errors
         if token:
-            from telegram.request import HTTPXRequest
-            # Use HTTPXRequest with increased connection pool size
-            request = HTTPXRequest(connection_pool_size=20, read_timeout=30, write_timeout=30, connect_timeout=30)
-            self.bot = Bot(token=token, request=request)
+            # Use HTTPXRequest with increased connection pool size; its httpx client keeps
+            # connections alive, and HTTP/2 multiplexes sends over one TLS session
+            if request is None:
+                request = _shared_request(256, 30, 30, 30, pool_timeout=10, http_version="2")
+            # getUpdates long-polls; its own small pool keeps it from holding send connections
+            if get_updates_request is None:
+                get_updates_request = _shared_request(4, 35)
+            self.bot = Bot(token=token, request=request, get_updates_request=get_updates_request)
         else:
             self.bot = None
-        self.stats = {
-            'wins': 0,
-            'losses': 0,
-            'ties': 0,
-            'consecutive_wins': 0,
-            'last_result': None
-        }
+        # Outbound queue and its consumer task; both live on the shared loop
+        self._outbox: Optional[asyncio.Queue] = None
+        self._drain_task: Optional[asyncio.Task] = None
+        # (hash, time.monotonic()) of the last delivered text per DEDUPE_KINDS kind
+        self._last_delivered: dict = {}
+        self.stats = BacBoStats()
         
     def _calculate_assertiveness_rate(self) -> float:
         """Calculate assertiveness rate"""
-        total = self.stats['wins'] + self.stats['losses']
-        if total == 0:
-            return 100.0
-        return (self.stats['wins'] / total) * 100
+        return self.stats.assertiveness
     
     def _get_scoreboard_message(self, language: str = 'en') -> str:
         """Generate scoreboard message"""
-        assertiveness = self._calculate_assertiveness_rate()
-        
-        if language == 'pt':
-            return (
-                f"PLACAR\n"
-                f"✓ :{self.stats['wins']}\n"
-                f"🟢 :{self.stats['losses']}\n"
-                f"🔴 :{self.stats['ties']}\n"
-                f"📊 GANHOS SEGUIDOS: {self.stats['consecutive_wins']}\n"
-                f"🎯 TAXA DE ASSERTIVIDADE: {assertiveness:.2f}%"
-            )
-        else:  # English
-            return (
-                f"SCOREBOARD\n"
-                f"✓ :{self.stats['wins']}\n"
-                f"🟢 :{self.stats['losses']}\n"
-                f"🔴 :{self.stats['ties']}\n"
-                f"📊 CONSECUTIVE WINS: {self.stats['consecutive_wins']}\n"
-                f"🎯 ASSERTIVENESS RATE: {assertiveness:.2f}%"
-            )
+        return self._SCOREBOARD_TMPL['pt' if language == 'pt' else 'en'].format(
+            wins=self.stats.wins,
+            losses=self.stats.losses,
+            ties=self.stats.ties,
+            cw=self.stats.consecutive_wins,
+            rate=self.stats.assertiveness
+        )
     
     def _format_entry_message(self, color: str, language: str = 'en') -> str:
         """
         Format entry confirmation message
         color: 'red' or 'blue' for player/banker
         """
-        if color.lower() == 'red':
-            color_emoji = '🔴'  # Red circle for player
-        else:  # blue
-            color_emoji = '🔵'  # Blue circle for banker
-        
-        tie_emoji = '🟢'  # Green circle for tie
-        
-        if language == 'pt':
-            return (
-                f"ENTRADA CONFIRMADA\n"
-                f"🎲 ENTRAR NA COR ({color_emoji})\n"
-                f"🎯 PROTEGER NO EMPATE ({tie_emoji})\n"
-                f"💰💰🤖 Entrar No Jogo"
-            )
-        else:  # English
-            return (
-                f"CONFIRMED ENTRY\n"
-                f"🎲 ENTER THE COLOR ({color_emoji})\n"
-                f"🎯 PROTECT ON TIE ({tie_emoji})\n"
-                f"💰💰🤖 Enter The Game"
-            )
+        return self._ENTRY_MESSAGES[
+            'red' if color.lower() == 'red' else 'blue',
+            'pt' if language == 'pt' else 'en'
+        ]
     
-    def send_entry_alert(self, player_percent: float, banker_percent: float, language: str = 'en') -> bool:
+    def send_entry_alert(self, player_percent: float, banker_percent: float, language: str = 'en',
+                         on_undelivered: Optional[Callable[[], None]] = None) -> bool:
         """
         Send entry confirmation alert when player odds are favorable
-        Returns True if message was sent successfully
+        Returns True once the alert is queued; delivery happens in the background, and
+        on_undelivered (called on the Telegram loop thread) reports one that never arrived
         """
         if not self.bot:
             logger.error("Telegram bot not initialized")
@@ -159,14 +309,13 @@ class BacBoTelegramBot:
         
         try:
             message = self._format_entry_message(color, language)
-            _run_async(self.bot.send_message(chat_id=self.chat_id, text=message))
-            logger.info(f"Sent entry alert: {bet_on} ({color})")
+            delivery = self._queue_message('alert', message)
+            if on_undelivered is not None:
+                delivery.add_done_callback(lambda f: f.result() or on_undelivered())
+            logger.info("Queued entry alert: %s (%s)", bet_on, color)
             return True
-        except TelegramError as e:
-            logger.error(f"Error sending Telegram message: {e}")
-            return False
         except Exception as e:
-            logger.error(f"Error sending entry alert: {e}")
+            logger.error("Error sending entry alert: %s", e)
             return False
     
     def send_win_notification(self, result: str, winning_color: str = 'red', language: str = 'en') -> bool:
@@ -180,9 +329,7 @@ class BacBoTelegramBot:
             return False
         
         if result == 'win':
-            self.stats['wins'] += 1
-            self.stats['consecutive_wins'] += 1
-            self.stats['last_result'] = 'win'
+            self.stats.record_win()
             
             # Win message format: "✓✓✓ GREEN (🟢)" or "✓✓✓ GREEN (🔴)"
             # The emoji shows which color won
@@ -193,27 +340,20 @@ class BacBoTelegramBot:
             
             message = f"✓✓✓ GREEN ({color_emoji})"
         else:  # loss
-            self.stats['losses'] += 1
-            self.stats['consecutive_wins'] = 0
-            self.stats['last_result'] = 'loss'
+            self.stats.record_loss()
             
             # Loss message format: "❌❌❌ LOSS (🔴)"
             message = "❌❌❌ LOSS (🔴)"
         
         try:
-            _run_async(self.bot.send_message(chat_id=self.chat_id, text=message))
-            
-            # Send updated scoreboard
+            # The result and the updated scoreboard go out as one message, one API call per round
             scoreboard = self._get_scoreboard_message(language)
-            _run_async(self.bot.send_message(chat_id=self.chat_id, text=scoreboard))
+            self._queue_message(result, f"{message}\n\n{scoreboard}")
             
-            logger.info(f"Sent {result} notification")
+            logger.info("Queued %s notification", result)
             return True
-        except TelegramError as e:
-            logger.error(f"Error sending Telegram message: {e}")
-            return False
         except Exception as e:
-            logger.error(f"Error sending win notification: {e}")
+            logger.error("Error sending win notification: %s", e)
             return False
     
     def send_scoreboard(self, language: str = 'en') -> bool:
@@ -223,13 +363,10 @@ class BacBoTelegramBot:
         
         try:
             message = self._get_scoreboard_message(language)
-            _run_async(self.bot.send_message(chat_id=self.chat_id, text=message))
+            self._queue_message('scoreboard', message)
             return True
-        except TelegramError as e:
-            logger.error(f"Error sending scoreboard: {e}")
-            return False
         except Exception as e:
-            logger.error(f"Error sending scoreboard: {e}")
+            logger.error("Error sending scoreboard: %s", e)
             return False
     
     def send_message(self, text: str) -> bool:
@@ -237,88 +374,142 @@ class BacBoTelegramBot:
         if not self.bot:
             logger.error("Telegram bot not initialized")
             return False
+        if not text or not text.strip():
+            # Telegram rejects empty messages, don't spend a request finding that out
+            logger.warning("Not sending empty Telegram message")
+            return False
         
         try:
-            _run_async(self.bot.send_message(chat_id=self.chat_id, text=text))
+            self._queue_message('message', text)
             return True
-        except TelegramError as e:
-            logger.error(f"Error sending Telegram message: {e}")
-            return False
         except Exception as e:
-            logger.error(f"Error sending Telegram message: {e}")
+            logger.error("Error sending Telegram message: %s", e)
             return False
     
     def send_startup_message(self, language: str = 'en') -> bool:
         """Send bot startup notification"""
-        if language == 'pt':
-            message = "🤖 Bot Bac Bo iniciado!\n\n📊 Monitorando o jogo...\n⏱️ Intervalo de verificação: 5 segundos\n🎯 Limite de alerta: Player > 98%"
-        else:
-            message = "🤖 Bac Bo Bot Started!\n\n📊 Monitoring game...\n⏱️ Check interval: 5 seconds\n🎯 Alert threshold: Player > 98%"
-        
-        return self.send_message(message)
+        return self.send_message(self._STARTUP_MESSAGES['pt' if language == 'pt' else 'en'])
     
     def send_shutdown_message(self, language: str = 'en') -> bool:
         """Send bot shutdown notification"""
-        if language == 'pt':
-            message = "🛑 Bot Bac Bo finalizado!\n\nO bot foi encerrado."
-        else:
-            message = "🛑 Bac Bo Bot Stopped!\n\nThe bot has been shut down."
-        
-        return self.send_message(message)
+        return self.send_message(self._SHUTDOWN_MESSAGES['pt' if language == 'pt' else 'en'])
     
-    def send_status_update(self, stats: Optional[Dict] = None, language: str = 'en') -> bool:
+    def send_status_update(self, stats: Optional['Stats'] = None, language: str = 'en') -> bool:
         """Send status update with current statistics"""
         if not self.bot:
             return False
         
         try:
+            lang = 'pt' if language == 'pt' else 'en'
             if stats:
-                player_pct = stats.get('player_percent', 0)
-                banker_pct = stats.get('banker_percent', 0)
-                tie_pct = stats.get('tie_percent', 0)
-                
-                if language == 'pt':
-                    message = (
-                        f"📊 Status Atual\n\n"
-                        f"👤 Jogador: {player_pct}%\n"
-                        f"🏦 Banca: {banker_pct}%\n"
-                        f"🤝 Empate: {tie_pct}%\n\n"
-                        f"{'✅ Condição de alerta ativada!' if player_pct > 50 else '⏳ Aguardando condição favorável...'}"
-                    )
-                else:
-                    message = (
-                        f"📊 Current Status\n\n"
-                        f"👤 Player: {player_pct}%\n"
-                        f"🏦 Banker: {banker_pct}%\n"
-                        f"🤝 Tie: {tie_pct}%\n\n"
-                        f"{'✅ Alert condition met!' if player_pct > 50 else '⏳ Waiting for favorable condition...'}"
-                    )
+                met, waiting = self._STATUS_VERDICTS[lang]
+                message = self._STATUS_TMPL[lang].format(
+                    player=stats.player_percent,
+                    banker=stats.banker_percent,
+                    tie=stats.tie_percent,
+                    verdict=met if stats.player_percent > 50 else waiting
+                )
             else:
-                if language == 'pt':
-                    message = (
-                        "⚠️ Não foi possível obter estatísticas do jogo.\n\n"
-                        "Possíveis causas:\n"
-                        "• Site pode estar bloqueando acesso automatizado\n"
-                        "• Página pode não estar carregando completamente\n"
-                        "• Conteúdo do jogo pode estar em iframe não detectado\n\n"
-                        "O bot continua monitorando..."
-                    )
-                else:
-                    message = (
-                        "⚠️ Could not retrieve game statistics.\n\n"
-                        "Possible causes:\n"
-                        "• Site may be blocking automated access\n"
-                        "• Page may not be loading completely\n"
-                        "• Game content may be in undetected iframe\n\n"
-                        "The bot continues monitoring..."
-                    )
+                message = self._NO_STATS_MESSAGES[lang]
             
-            _run_async(self.bot.send_message(chat_id=self.chat_id, text=message))
+            self._queue_message('status', message)
             return True
-        except TelegramError as e:
-            logger.error(f"Error sending status update: {e}")
-            return False
         except Exception as e:
-            logger.error(f"Error sending status update: {e}")
+            logger.error("Error sending status update: %s", e)
             return False
+    
+    def _queue_message(self, kind: str, text: str) -> concurrent.futures.Future:
+        """Hand a message to the outbox consumer on the shared loop (returns immediately).
 
+        Every send_* goes through here, so the scrape loop never waits on Telegram and
+        the send_* methods return True as soon as the message is queued. The returned
+        future resolves to True once Telegram accepted the message (or it was skipped as
+        a repeat of one that was), False if it was dropped or failed after retries.
+        Call flush() before exiting to deliver what is still queued.
+        """
+        delivery = concurrent.futures.Future()
+        if self._is_repeat(kind, text):
+            logger.debug("Skipping %s message, unchanged since the last one", kind)
+            delivery.set_result(True)
+            return delivery
+        _submit_async(self._enqueue(kind, text, delivery))
+        return delivery
+    
+    def _is_repeat(self, kind: str, text: str) -> bool:
+        """True for a DEDUPE_KINDS text identical to the last one delivered, within DEDUPE_REPEAT_AFTER"""
+        if kind not in DEDUPE_KINDS:
+            return False
+        last = self._last_delivered.get(kind)
+        return last is not None and last[0] == hash(text) and time.monotonic() - last[1] < DEDUPE_REPEAT_AFTER
+    
+    def flush(self, timeout: float = 5) -> bool:
+        """Block until every queued message has been handed to Telegram; False if timeout passed first"""
+        future = _submit_async(self._wait_drained())
+        try:
+            future.result(timeout=timeout)
+            return True
+        except concurrent.futures.TimeoutError:
+            logger.warning("Telegram outbox not drained within %ss", timeout)
+            future.cancel()
+            return False
+    
+    async def _wait_drained(self):
+        if self._outbox is not None:
+            await self._outbox.join()
+    
+    async def _enqueue(self, kind: str, text: str, delivery: concurrent.futures.Future):
+        """Runs on the shared loop: push to the outbox and make sure a consumer is draining it"""
+        if self._outbox is None:
+            self._outbox = asyncio.Queue(maxsize=OUTBOX_MAXSIZE)
+        try:
+            self._outbox.put_nowait((kind, text, delivery))
+        except asyncio.QueueFull:
+            logger.warning("Telegram outbox full, dropping %s message", kind)
+            delivery.set_result(False)
+            return
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.get_running_loop().create_task(self._drain())
+    
+    async def _drain(self):
+        """Send queued messages in order, a burst at a time; exits when the outbox is empty"""
+        while not self._outbox.empty():
+            # A status and an error notice or scoreboard arrive together: let the burst gather
+            # and send those as one message (alerts and results still go out on their own)
+            await asyncio.sleep(OUTBOX_COALESCE_WINDOW)
+            items = []
+            while not self._outbox.empty():
+                items.append(self._outbox.get_nowait())
+            try:
+                # Repeats queued before the first copy was delivered, and copies within this burst:
+                # only the latest of those is sent, and the earlier ones share its outcome
+                latest = {}
+                for index, (kind, text, delivery) in enumerate(items):
+                    if kind in DEDUPE_KINDS:
+                        latest[kind, hash(text)] = index
+                pending = []
+                for index, (kind, text, delivery) in enumerate(items):
+                    if self._is_repeat(kind, text):
+                        delivery.set_result(True)
+                    elif kind in DEDUPE_KINDS and latest[kind, hash(text)] != index:
+                        kept = items[latest[kind, hash(text)]][2]
+                        kept.add_done_callback(lambda f, d=delivery: d.set_result(f.result()))
+                    else:
+                        pending.append((kind, text, delivery))
+                for text, sent in _merge_items(pending):
+                    delivered = False
+                    try:
+                        await _call_with_retry(lambda: self.bot.send_message(chat_id=self.chat_id, text=text))
+                        delivered = True
+                    except Exception as e:  # TelegramError after retries, or anything unexpected
+                        logger.error("Error sending queued Telegram message: %s", e)
+                    # Only a delivered text suppresses its repeats; a failed one goes out again next time
+                    delivered_at = time.monotonic()
+                    for kind, sent_text, delivery in sent:
+                        if delivered and kind in DEDUPE_KINDS:
+                            self._last_delivered[kind] = (hash(sent_text), delivered_at)
+                        delivery.set_result(delivered)
+                    # Stay well under Telegram's ~30 messages/second limit
+                    await asyncio.sleep(OUTBOX_SEND_INTERVAL)
+            finally:
+                for _ in items:
+                    self._outbox.task_done()
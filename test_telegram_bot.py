@@ -0,0 +1,44 @@
+"""
+Tests for the Telegram outbox
+"""
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from telegram_bot import BacBoTelegramBot
+
+
+class OutboxTest(unittest.TestCase):
+    def setUp(self):
+        self.telegram_bot = BacBoTelegramBot(token=None, chat_id='1')
+        self.telegram_bot.bot = AsyncMock()
+
+    def sent_texts(self):
+        return [call.kwargs['text'] for call in self.telegram_bot.bot.send_message.await_args_list]
+
+    def test_identical_statuses_in_one_burst_are_sent_once(self):
+        stats = SimpleNamespace(player_percent=99, banker_percent=1, tie_percent=0)
+        self.assertTrue(self.telegram_bot.send_status_update(stats=stats))
+        self.assertTrue(self.telegram_bot.send_status_update(stats=stats))
+        self.assertTrue(self.telegram_bot.flush(timeout=5))
+
+        sent = self.sent_texts()
+        self.assertEqual(len(sent), 1)
+        self.assertEqual(sent[0].count("📊 Current Status"), 1)
+
+    def test_alert_is_not_merged_with_statuses(self):
+        waiting = SimpleNamespace(player_percent=40, banker_percent=55, tie_percent=5)
+        met = SimpleNamespace(player_percent=99, banker_percent=1, tie_percent=0)
+        self.telegram_bot.send_status_update(stats=waiting)
+        self.telegram_bot.send_entry_alert(player_percent=99, banker_percent=1)
+        self.telegram_bot.send_status_update(stats=met)
+        self.assertTrue(self.telegram_bot.flush(timeout=5))
+
+        sent = self.sent_texts()
+        self.assertEqual(len(sent), 3)
+        self.assertTrue(sent[1].startswith("CONFIRMED ENTRY"))
+        self.assertNotIn("📊 Current Status", sent[1])
+
+
+if __name__ == '__main__':
+    unittest.main()